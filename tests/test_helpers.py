@@ -0,0 +1,252 @@
+"""Tests for the pure helpers and the HTTP client in "venom_console .py", run against local stubs only.
+
+Run from the repository root with: python -m pytest -q tests
+"""
+import http.server
+import importlib.util
+import json
+import os
+import random
+import sys
+import threading
+import urllib.request
+import zlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_spec = importlib.util.spec_from_file_location("venom_console", os.path.join(ROOT, "venom_console .py"))
+vc = importlib.util.module_from_spec(_spec)
+sys.modules["venom_console"] = vc
+_spec.loader.exec_module(vc)
+
+
+# ---- parse_opts ----
+
+def test_parse_opts_flags_options_and_positionals():
+    pos, opts = vc.parse_opts('src dst --jobs 4 --max-depth=2 --dry-run -x', flags=("--dry-run",),
+                              options=("--jobs", "--max-depth"))
+    assert pos == ["src", "dst", "-x"]
+    assert opts == {"jobs": "4", "max_depth": "2", "dry_run": True}
+
+
+def test_parse_opts_option_without_value():
+    pos, opts = vc.parse_opts("--out", options=("--out",))
+    assert pos == [] and opts == {"out": ""}
+
+
+# ---- IgnoreRules ----
+
+def _rules(*lines):
+    base = os.path.join(os.sep, "r")
+    rules = vc.IgnoreRules()
+    for line in lines:
+        rules.add(line, base)
+    return rules, lambda *parts: os.path.join(base, *parts)
+
+
+def test_ignore_rules_last_match_wins():
+    rules, p = _rules("*.log", "!keep.log", "# comment", "")
+    assert rules.match(p("a.log"), False)
+    assert rules.match(p("sub", "b.log"), False)
+    assert not rules.match(p("keep.log"), False)
+    assert not rules.match(p("a.txt"), False)
+
+
+def test_ignore_rules_dir_only_and_anchored():
+    rules, p = _rules("build/", "docs/tmp")
+    assert rules.match(p("x", "build"), True)
+    assert not rules.match(p("x", "build"), False)
+    assert rules.match(p("docs", "tmp"), True)
+    assert not rules.match(p("x", "docs", "tmp"), True)
+
+
+def test_ignore_rules_outside_base_do_not_apply():
+    rules, _ = _rules("*.log")
+    assert not rules.match(os.path.join(os.sep, "other", "a.log"), False)
+
+
+# ---- crc32_combine ----
+
+@pytest.mark.parametrize("la,lb", [(0, 0), (0, 5), (7, 0), (1, 1), (1000, 3), (70000, 123457)])
+def test_crc32_combine_matches_zlib(la, lb):
+    rnd = random.Random(la * 31 + lb)
+    a, b = rnd.randbytes(la), rnd.randbytes(lb)
+    assert vc.crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)) == zlib.crc32(a + b)
+
+
+# ---- SSEParser ----
+
+def test_sse_parser_handles_split_bytes_crlf_and_comments():
+    stream = 'data: {"t": "café"}\r\n\r\n: keepalive\n\ndata: a\ndata:b\n\ndata: [DONE]\n\n'.encode()
+    parser, events = vc.SSEParser(), []
+    for i in range(len(stream)):            # one byte at a time splits the UTF-8 sequence too
+        events += parser.feed(stream[i:i + 1])
+    assert events == ['{"t": "café"}', "a\nb", "[DONE]"]
+
+
+def test_sse_parser_keeps_incomplete_event():
+    parser = vc.SSEParser()
+    assert parser.feed(b"data: part") == []
+    assert parser.feed(b"ial\n\n") == ["partial"]
+
+
+# ---- ChatContext ----
+
+def test_chat_context_stays_within_budget_and_starts_at_user():
+    ctx = vc.ChatContext(budget=200)
+    for i in range(30):
+        ctx.append("user", f"question {i} " + "x" * 120)
+        msgs = ctx.messages()
+        assert sum(vc._message_tokens(m) for m in msgs) <= ctx.budget or len(msgs) <= 2
+        window = [m for m in msgs if m["role"] != "system"]
+        assert window[0]["role"] == "user"
+        assert window[-1]["content"].startswith(f"question {i} ")
+        ctx.append("assistant", f"answer {i} " + "y" * 120)
+    assert ctx.folded > 0
+    assert msgs[0]["role"] == "system" and "Summary" in msgs[0]["content"]
+
+
+def test_chat_context_pop_removes_pending_turn():
+    ctx = vc.ChatContext()
+    ctx.append("user", "hello")
+    ctx.pop()
+    assert ctx.messages() == []
+
+
+# ---- DnsCache / dns_lookup ----
+
+def test_dns_cache_ttls(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(vc.time, "monotonic", lambda: now[0])
+    cache = vc.DnsCache()
+    cache.put(("A", "ok"), ("ok", [], ["1.2.3.4"]), None)
+    cache.put(("A", "bad"), None, OSError("nope"))
+    assert cache.get(("A", "ok"))[0][2] == ["1.2.3.4"]
+    now[0] += vc.DNS_NEG_TTL + 1
+    assert cache.get(("A", "bad")) is None
+    assert cache.get(("A", "ok")) is not None
+    now[0] += vc.DNS_TTL
+    assert cache.get(("A", "ok")) is None
+
+
+def test_dns_lookup_invalid_name_is_a_cached_error():
+    vc.DNS_CACHE.clear()
+    result, error, _, cached = vc.dns_lookup("a..com")
+    assert result is None and isinstance(error, ValueError) and not cached
+    assert vc.dns_lookup("a..com")[3]
+
+
+# ---- snapshot_diff ----
+
+def test_snapshot_diff_records_and_text_sections():
+    old = {"sections": {"ipconfig": {"text": "Adapter [x\nsame [a] line\nold line\n"},
+                        "interfaces": [{"name": "eth0", "mtu": 1500}, {"name": "lo", "mtu": 1}]}}
+    new = {"sections": {"ipconfig": {"text": "Adapter [y\nsame [a] line\n"},
+                        "interfaces": [{"name": "eth0", "mtu": 9000}, {"name": "wl0", "mtu": 1}]}}
+    lines = vc.snapshot_diff(old, new)
+    assert "~ interfaces[eth0].mtu: 1500 -> 9000" in lines
+    assert "- interfaces[lo] mtu=1 name=lo" in lines
+    assert "+ interfaces[wl0] mtu=1 name=wl0" in lines
+    assert "- ipconfig.text:Adapter [x" in lines and "+ ipconfig.text:Adapter [y" in lines
+    assert "- ipconfig.text:old line" in lines
+    assert not any("same [a] line" in line for line in lines)
+
+
+def test_snapshot_diff_identical():
+    snap = {"sections": {"whoami": {"user": "u", "hostname": "h"}}}
+    assert vc.snapshot_diff(snap, snap) == []
+
+
+# ---- smaller helpers ----
+
+def test_path_within(tmp_path):
+    inner = tmp_path / "a" / "b"
+    inner.mkdir(parents=True)
+    assert vc._path_within(str(inner), str(tmp_path / "a"))
+    assert vc._path_within(str(tmp_path / "a"), str(tmp_path / "a"))
+    assert not vc._path_within(str(tmp_path / "ab"), str(tmp_path / "a"))
+
+
+def test_hex_pattern_needs_prefix():
+    assert vc._hex_pattern("cafe") == b"cafe"
+    assert vc._hex_pattern("hex:DE ad") == b"\xde\xad"
+    with pytest.raises(ValueError):
+        vc._hex_pattern("hex:zz")
+
+
+def test_load_recipients_ignores_extra_fields(tmp_path):
+    path = tmp_path / "r.csv"
+    path.write_text("email,name\na@x.com,Al,EXTRA\n,,\nb@x.com\n", encoding="utf-8")
+    assert vc._load_recipients(str(path)) == [{"email": "a@x.com", "name": "Al"}, {"email": "b@x.com", "name": ""}]
+
+
+def test_smtp_transient():
+    import smtplib
+    assert vc._smtp_transient(smtplib.SMTPConnectError(421, b"busy"))
+    assert not vc._smtp_transient(smtplib.SMTPConnectError(554, b"no"))
+    assert vc._smtp_transient(ConnectionRefusedError())
+    assert vc._smtp_transient(smtplib.SMTPServerDisconnected())
+
+
+# ---- http_request against a local stub ----
+
+class _Stub(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(json.dumps({"host": self.headers["Host"], "path": self.path}).encode())
+
+    def do_POST(self):
+        n = int(self.headers["Content-Length"])
+        self._reply(str(len(self.rfile.read(n))).encode())
+        self.close_connection = True   # silently drop keep-alive: the next request must retry
+
+
+@pytest.fixture
+def stub():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_request_keepalive_and_host_header(stub, monkeypatch):
+    monkeypatch.setattr(urllib.request, "getproxies", lambda: {})   # talk to the stub directly
+    pool = vc.HttpPool(5)
+    try:
+        resp, data, timing = vc.http_request(pool, "GET", stub + "/a?b=1")
+        assert resp.status == 200 and not timing["reused"]
+        assert json.loads(data) == {"host": stub[len("http://"):], "path": "/a?b=1"}
+        _, _, timing = vc.http_request(pool, "GET", stub + "/again")
+        assert timing["reused"]
+    finally:
+        pool.close()
+
+
+def test_http_request_resends_callable_body_after_stale_connection(stub, monkeypatch):
+    monkeypatch.setattr(urllib.request, "getproxies", lambda: {})
+    pool = vc.HttpPool(5)
+    block, calls = b"x" * 200000, [0]
+
+    def body():
+        calls[0] += 1
+        for i in range(0, len(block), 65536):
+            yield block[i:i + 65536]
+    try:
+        for _ in range(2):
+            _, data, _ = vc.http_request(pool, "POST", stub + "/", {"Content-Length": str(len(block))}, body=body)
+            assert data == str(len(block)).encode()
+    finally:
+        pool.close()
+    assert calls[0] == 3   # second request: stale attempt + retry on a fresh connection
@@ -85,6 +85,7 @@ YELLOW = ORANGE
 # ---------------- Globals ----------------
 VERSION = "venom.console v1.6-windows-full"
 HIST_PATH = os.path.join(tempfile.gettempdir(), "venom_history.txt")
+INDEX_PATH = os.path.join(tempfile.gettempdir(), "venom_index.db")
 
 def save_history(entry: str):
     try:
@@ -122,6 +123,39 @@ def run_quiet(cmd, timeout=None):
     except Exception as e:
         return "", str(e), -1
 
+def parse_opts(args, flags=(), options=()):
+    """Split an argument string into (positionals, opts).
+
+    flags are boolean switches (--regex); options take a value (--jobs 4 or --jobs=4).
+    Keys in opts drop the leading dashes and use '_' for '-' (--max-depth -> max_depth).
+    Unknown dash tokens are left in the positionals.
+    """
+    import shlex
+    try:
+        tokens = shlex.split(args or "", posix=not IS_WINDOWS)
+    except ValueError:
+        tokens = (args or "").split()
+    if IS_WINDOWS:
+        tokens = [t[1:-1] if len(t) >= 2 and t[0] == t[-1] == '"' else t for t in tokens]
+    pos, opts = [], {}
+    it = iter(tokens)
+    for tok in it:
+        name, eq, val = tok.partition("=")
+        key = name.lstrip("-").replace("-", "_")
+        if name in flags and not eq:
+            opts[key] = True
+        elif name in options:
+            opts[key] = val if eq else next(it, "")
+        else:
+            pos.append(tok)
+    return pos, opts
+
+def opt_int(opts, key, default):
+    try:
+        return int(opts.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
 def get_local_outbound_ip():
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -132,17 +166,41 @@ def get_local_outbound_ip():
     except Exception:
         return None
 
-def get_public_ip():
-    services = ["https://api.ipify.org?format=text", "https://ifconfig.co/ip", "https://icanhazip.com"]
-    for url in services:
+# Public IP providers, raced in parallel; override with VENOM_IP_SERVICES="url1,url2" (e.g. local stubs).
+PUBLIC_IP_SERVICES = [u.strip() for u in os.environ.get(
+    "VENOM_IP_SERVICES", "https://api.ipify.org?format=text,https://ifconfig.co/ip,https://icanhazip.com").split(",") if u.strip()]
+PUBLIC_IP_TTL = 60       # seconds an answer is reused by myip/saveinfo
+PUBLIC_IP_TIMEOUT = 5
+_public_ip_cache = {"ip": None, "at": 0.0}
+
+def get_public_ip(timeout=PUBLIC_IP_TIMEOUT, services=None, fresh=False):
+    """Ask every provider at once and return the first answer that parses as an IP (None if all fail).
+    Slower providers are abandoned, not waited for. Answers are cached for PUBLIC_IP_TTL seconds."""
+    import ipaddress, queue, threading, urllib.request
+    if not fresh and _public_ip_cache["ip"] and time.monotonic() - _public_ip_cache["at"] < PUBLIC_IP_TTL:
+        return _public_ip_cache["ip"]
+    services = services or PUBLIC_IP_SERVICES
+    answers = queue.Queue()
+
+    def ask(url):
         try:
-            import urllib.request
-            with urllib.request.urlopen(url, timeout=5) as r:
+            with urllib.request.urlopen(url, timeout=timeout) as r:
                 txt = r.read(128).decode("utf-8", errors="replace").strip()
-                if txt:
-                    return txt
+            answers.put(str(ipaddress.ip_address(txt)))
         except Exception:
-            continue
+            answers.put(None)
+
+    for url in services:
+        threading.Thread(target=ask, args=(url,), daemon=True).start()
+    deadline = time.monotonic() + timeout
+    for _ in services:
+        try:
+            ip = answers.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        if ip:
+            _public_ip_cache.update(ip=ip, at=time.monotonic())
+            return ip
     return None
 
 # ---------------- Commands ----------------
@@ -150,15 +208,149 @@ import os
 import shutil
 
 # ==== AI ====
+CHAT_URL = os.environ.get("VENOM_CHAT_URL", "https://router.huggingface.co/v1/chat/completions")
+CHAT_MODEL = "MiniMaxAI/MiniMax-M2"
+CHAT_TIMEOUT = 30        # seconds without any data before a reply is abandoned
+
+CHAT_BUDGET = 4000       # estimated prompt tokens sent per turn (window + summary)
+CHAT_SUMMARY_SHARE = 0.25   # part of the budget the summary of older turns may use
+CHAT_SUMMARY_CHARS = 200    # characters kept from each folded message
+
+def estimate_tokens(text):
+    """Cheap local token estimate: about 4 bytes of UTF-8 per token."""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+def _message_tokens(m):
+    return estimate_tokens(m["content"]) + 4   # role and framing overhead
+
+class ChatContext:
+    """Fits a growing chat history into a token budget.
+    Recent turns are sent verbatim (sliding window); older ones are folded, once, into a cached
+    extractive summary that travels as a system message."""
+
+    def __init__(self, budget=CHAT_BUDGET):
+        self.budget = budget
+        self.history = []
+        self.folded = 0          # history[:folded] is represented by the summary
+        self.summary_lines = []
+
+    def append(self, role, content):
+        self.history.append({"role": role, "content": content})
+
+    def pop(self):
+        self.history.pop()
+
+    def _summary(self):
+        return {"role": "system", "content": "Summary of the earlier conversation:\n" + "\n".join(self.summary_lines)}
+
+    def _fold(self, upto):
+        for m in self.history[self.folded:upto]:
+            text = " ".join(m["content"].split())
+            if len(text) > CHAT_SUMMARY_CHARS:
+                text = text[:CHAT_SUMMARY_CHARS - 3].rstrip() + "..."
+            self.summary_lines.append(f"{m['role']}: {text}")
+        self.folded = upto
+        limit = int(self.budget * CHAT_SUMMARY_SHARE)
+        while len(self.summary_lines) > 1 and _message_tokens(self._summary()) > limit:
+            self.summary_lines.pop(0)   # the oldest lines go first
+
+    def messages(self):
+        """Messages to send this turn: [summary] + the newest turns that fit the budget.
+        The window always starts at a user message and keeps at least the latest one."""
+        total = sum(_message_tokens(m) for m in self.history[self.folded:])
+        if self.summary_lines or total > self.budget:
+            target = self.budget - int(self.budget * CHAT_SUMMARY_SHARE)   # leave room for the summary
+        else:
+            target = self.budget
+        cut = self.folded
+        while total > target and cut < len(self.history) - 1:
+            total -= _message_tokens(self.history[cut])
+            cut += 1
+            while cut < len(self.history) - 1 and self.history[cut]["role"] != "user":
+                total -= _message_tokens(self.history[cut])
+                cut += 1
+        if cut > self.folded:
+            self._fold(cut)
+        return ([self._summary()] if self.summary_lines else []) + self.history[self.folded:]
+
+class SSEParser:
+    """Incremental server-sent-events parser: feed() bytes, get back the complete events' data strings."""
+
+    def __init__(self):
+        import codecs
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.buf = ""
+        self.data = []
+
+    def feed(self, chunk):
+        self.buf += self.decoder.decode(chunk)
+        events = []
+        while True:
+            line, sep, rest = self.buf.partition("\n")
+            if not sep:
+                return events
+            self.buf = rest
+            line = line.rstrip("\r")
+            if not line:
+                if self.data:
+                    events.append("\n".join(self.data))
+                    self.data = []
+            elif line.startswith("data:"):
+                self.data.append(line[5:].lstrip(" ") if line[5:6] == " " else line[5:])
+            # 'event:', 'id:', 'retry:' and ':' comments are not needed here
+
+def chat_stream(pool, messages, api_key, on_token):
+    """POST a streaming chat completion and call on_token(text) as deltas arrive.
+    Returns (full text, stats) where stats has ttft, tokens, tok_s, seconds and request_bytes."""
+    import json
+    body = json.dumps({"model": CHAT_MODEL, "messages": messages, "stream": True}).encode("utf-8")
+    parser = SSEParser()
+    parts = []
+    st = {"ttft": None, "tokens": 0, "usage": None, "done": False}
+    t0 = time.perf_counter()
+
+    def sink(chunk):
+        if st["done"]:
+            return
+        for data in parser.feed(chunk):
+            if data.strip() == "[DONE]":
+                st["done"] = True
+                return
+            try:
+                event = json.loads(data)
+            except ValueError:
+                continue
+            if event.get("usage"):
+                st["usage"] = event["usage"].get("completion_tokens")
+            for choice in event.get("choices") or []:
+                text = (choice.get("delta") or {}).get("content")
+                if text:
+                    if st["ttft"] is None:
+                        st["ttft"] = time.perf_counter() - t0
+                    st["tokens"] += 1
+                    parts.append(text)
+                    on_token(text)
+
+    resp, _, _ = http_request(pool, "POST", CHAT_URL, {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json",
+                                                       "Accept": "text/event-stream"}, body=body, sink=sink, expect={200})
+    if resp.status != 200:
+        raise OSError(f"HTTP error: {resp.status} {resp.reason}")
+    elapsed = time.perf_counter() - t0
+    tokens = st["usage"] or st["tokens"]
+    gen_time = elapsed - (st["ttft"] or 0.0)
+    return "".join(parts), {"ttft": st["ttft"], "tokens": tokens, "seconds": elapsed, "request_bytes": len(body),
+                            "tok_s": tokens / gen_time if tokens and gen_time > 0 else 0.0}
 
 def cmd_chatbot(self=None, arg=None):
     """
     Interactive MiniMax AI chat session.
     Normal venom.console commands work if prefixed with 'venom.console'.
     Uses shared API key included with the project.
+    chatbot --budget N caps the estimated prompt tokens per turn (older turns are summarized).
     """
-    import json, urllib.request, urllib.error
-
+    import json, http.client
+    # COMMANDS passes the argument string positionally
+    pos, opts = parse_opts(self if isinstance(self, str) else arg or "", options=("--budget",))
     api_key = HF_API_KEY
     
     if not api_key or not api_key.startswith("hf_"):
@@ -166,7 +358,8 @@ def cmd_chatbot(self=None, arg=None):
         return
 
     print("Starting MiniMax AI chat. Type 'venom.console <command>' to run console commands. Ctrl+C to exit.\n")
-    history = []
+    context = ChatContext(max(256, opt_int(opts, "budget", CHAT_BUDGET)))
+    pool = HttpPool(timeout=CHAT_TIMEOUT)   # keeps the connection alive between turns
 
     try:
         while True:
@@ -190,28 +383,33 @@ def cmd_chatbot(self=None, arg=None):
                     print(f"'{cmd_text}' is not a recognized command.")
                 continue  # back to chatbot prompt
 
-            # --- Otherwise, send to AI ---
-            history.append({"role": "user", "content": user_input})
-            body = json.dumps({"model": "MiniMaxAI/MiniMax-M2", "messages": history}).encode("utf-8")
-            req = urllib.request.Request(
-                "https://router.huggingface.co/v1/chat/completions",
-                data=body,
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                method="POST"
-            )
-
+            # --- Otherwise, send to AI (streamed: tokens are printed as they arrive) ---
+            context.append("user", user_input)
+            messages = context.messages()
+            print("\nMiniMax: ", end="", flush=True)
             try:
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    data = json.loads(resp.read().decode("utf-8"))
-                    message = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    print("\nMiniMax:", message, "\n")
-                    history.append({"role": "assistant", "content": message})
-            except urllib.error.HTTPError as e:
-                print("HTTP error:", e.code, e.reason)
-            except urllib.error.URLError as e:
-                print("Connection error:", e.reason)
+                message, st = chat_stream(pool, messages, api_key, lambda t: print(t, end="", flush=True))
+            except KeyboardInterrupt:
+                print("\n(response interrupted)\n")
+                context.pop()
+                continue
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                # a dropped stream (IncompleteRead, ...) ends this turn, not the session
+                print("\n" + (str(e) if str(e).startswith("HTTP error") else f"Connection error: {e}"), "\n")
+                context.pop()
+                continue
+            print("\n")
+            ttft = f"{st['ttft']:.2f}s" if st["ttft"] is not None else "-"
+            full = len(json.dumps({"model": CHAT_MODEL, "messages": context.history, "stream": True}).encode("utf-8"))
+            print(f"[ttft {ttft}, {st['tokens']} tokens, {st['tok_s']:.1f} tok/s, {st['seconds']:.1f}s | "
+                  f"request {format_size(st['request_bytes'])} (full history {format_size(full)}), "
+                  f"~{sum(_message_tokens(m) for m in messages)}/{context.budget} tokens, "
+                  f"{context.folded} message(s) summarized]\n")
+            context.append("assistant", message)
     except KeyboardInterrupt:
         print("\nReturning to venom.console prompt...")
+    finally:
+        pool.close()
 
 
 
@@ -240,18 +438,11 @@ def cmd_copy(src=None, dst=None):
         if os.path.isdir(dst):
             dst = os.path.join(dst, os.path.basename(src))
 
-        for attempt in range(3):
-            try:
-                with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
-                    shutil.copyfileobj(fsrc, fdst)
-                print(f"Copied: {os.path.abspath(src)} -> {os.path.abspath(dst)}")
-                return
-            except OSError as e:
-                if hasattr(e, "winerror") and e.winerror == 32 and attempt < 2:
-                    print(f"File in use... retrying ({attempt+1}/3)")
-                    time.sleep(0.5)
-                    continue
-                raise
+        if os.path.isdir(src):
+            copy_tree(src, dst)
+        else:
+            retry_locked(copy_file, src, dst, False, Progress(os.path.getsize(src)))
+        print(f"Copied: {os.path.abspath(src)} -> {os.path.abspath(dst)}")
     except Exception as e:
         print(f"Copy error: {e}")
 
@@ -300,20 +491,8 @@ def cmd_delete(target=None):
             print("Cancelled.")
             return
 
-        for attempt in range(3):
-            try:
-                if os.path.isdir(target):
-                    shutil.rmtree(target)
-                else:
-                    os.remove(target)
-                print(f"Deleted: {os.path.abspath(target)}")
-                return
-            except OSError as e:
-                if hasattr(e, "winerror") and e.winerror == 32 and attempt < 2:
-                    print(f"File in use... retrying ({attempt+1}/3)")
-                    time.sleep(0.5)
-                    continue
-                raise
+        remove_path(target)
+        print(f"Deleted: {os.path.abspath(target)}")
     except Exception as e:
         print(f"Delete error: {e}")
 
@@ -362,11 +541,101 @@ def cmd_cd(path):
     except Exception as e:
         print(f"Error changing directory: {e}")
 
+CAT_CHUNK = 64 * 1024
+
+def _cat_stream(f, end=None):
+    """Decode f (binary) from its current position in CAT_CHUNK pieces, replacing bad UTF-8.
+    Returns the last character written ('' if nothing)."""
+    import codecs
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    last = ""
+    while True:
+        want = CAT_CHUNK if end is None else min(CAT_CHUNK, end - f.tell())
+        chunk = f.read(want) if want > 0 else b""
+        text = decoder.decode(chunk, final=not chunk)
+        if text:
+            sys.stdout.write(text)
+            last = text[-1]
+        if not chunk:
+            return last
+
+def _tail_offset(f, lines):
+    """Offset where the last `lines` lines of f start, found by reading blocks backward from the end."""
+    end = f.seek(0, os.SEEK_END)
+    pos, count = end, 0
+    # a trailing newline ends the last line; it does not start a new one
+    if end:
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            count = -1
+    while pos > 0:
+        step = min(CAT_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        block = f.read(step)
+        nl = block.count(b"\n")
+        if count + nl >= lines:
+            idx = len(block)
+            for _ in range(lines - count):
+                idx = block.rfind(b"\n", 0, idx)
+            return pos + idx + 1
+        count += nl
+    return 0
+
+def _cat_follow(f, path, interval=0.5):
+    """Poll the file size and print whatever was appended; restarts if the file is truncated."""
+    pos = f.tell()
+    while True:
+        time.sleep(interval)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        if size < pos:
+            print(f"\n--- {path} truncated ---")
+            pos = 0
+        if size > pos:
+            f.seek(pos)
+            _cat_stream(f, size)
+            sys.stdout.flush()
+            pos = size
+
 def cmd_cat(file_path):
-    """Displays the contents of a file."""
+    """cat <file> [--head N | --tail N] [--follow] — stream a file's contents (invalid UTF-8 is replaced)."""
+    pos, opts = parse_opts(file_path, flags=("--follow", "-f"), options=("--head", "--tail", "-n"))
+    path = " ".join(pos) or input("File to display: ").strip()
+    follow = opts.get("follow") or opts.get("f")
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            print(f.read())
+        head = max(0, int(opts["head"])) if opts.get("head") else None
+        tail = max(0, int(opts.get("tail") or opts.get("n") or 10))
+    except ValueError as e:
+        print(f"Invalid line count: {e}")
+        return
+    try:
+        with open(path, "rb") as f:
+            last = ""
+            if head is not None:
+                # line by line on the binary file, so f.tell() is exactly where --follow picks up
+                for _ in range(head):
+                    line = f.readline()
+                    if not line:
+                        break
+                    text = line.decode("utf-8", errors="replace")
+                    sys.stdout.write(text)
+                    last = text[-1:]
+            elif opts.get("tail") or opts.get("n") or follow:
+                f.seek(_tail_offset(f, tail))
+                last = _cat_stream(f)
+            else:
+                last = _cat_stream(f)
+            if last and last != "\n":
+                sys.stdout.write("\n")
+            sys.stdout.flush()
+            if follow:
+                print(f"--- following {path} (Ctrl+C to stop) ---")
+                _cat_follow(f, path)
+    except KeyboardInterrupt:
+        print("\nStopped.")
     except Exception as e:
         print(f"Error reading file: {e}")
 
@@ -407,7 +676,7 @@ def cmd_help(args=""):
     print("  http, download, open, sendemail/email")
 
     set_color(BLUE); print("\n[Files]"); reset_color()
-    print("  ls/dir, cd, cat/type, copy, del/rm, rename/mv, mkdir, rmdir, find, search, copyfile, movefile, deletefile, compress, extract, filesize, recent")
+    print("  ls/dir, cd, cat/type, copy, del/rm, rename/mv, mkdir, rmdir, find, index, search, copyfile, sync, movefile, deletefile, compress, extract, filesize, du, recent, dupes, hash, verify")
 
     set_color(BLUE); print("\n[Utilities]"); reset_color()
     print("  calc, time, date, randtitle, sleep, echo, history, savehistory, remind, timer, clock")
@@ -547,8 +816,8 @@ def cmd_battery(args=""):
 
 # --- Network ---
 def cmd_myip(args=""):
-    """Displays hostname, local IP, and public IP (if available)."""
-    import socket, urllib.request
+    """Displays hostname, local IP, and public IP (if available). --refresh bypasses the cached public IP."""
+    pos, opts = parse_opts(args, flags=("--refresh",))
 
     try:
         hostname = socket.gethostname()
@@ -556,10 +825,7 @@ def cmd_myip(args=""):
     except Exception:
         hostname, local_ip = "Unavailable", "Unavailable"
 
-    try:
-        public_ip = urllib.request.urlopen("https://api.ipify.org").read().decode()
-    except Exception:
-        public_ip = "Unavailable"
+    public_ip = get_public_ip(fresh=bool(opts.get("refresh"))) or "Unavailable"
 
     print(f"Hostname: {hostname}")
     print(f"Local IP: {local_ip}")
@@ -585,24 +851,174 @@ def cmd_pinginline(args=""):
             return
     run_and_print(f"ping {args}")
 
+# ---- in-process concurrent pinger (TCP connect / unprivileged ICMP) ----
+PING_WINDOW = 100        # probes kept per target for rolling statistics
+PING_PORT = 443
+
+class PingStats:
+    """Rolling RTT statistics for one target over a fixed-size ring buffer (None = lost probe)."""
+
+    def __init__(self, window=PING_WINDOW):
+        from collections import deque
+        self.ring = deque(maxlen=window)
+        self.sent = self.received = 0
+
+    def add(self, rtt):
+        self.sent += 1
+        if rtt is not None:
+            self.received += 1
+        self.ring.append(rtt)
+
+    def summary(self):
+        """{'min','avg','max','p95' (seconds or None), 'loss' (%), 'window'} over the ring."""
+        import math
+        rtts = sorted(r for r in self.ring if r is not None)
+        n = len(self.ring)
+        out = {"window": n, "loss": (n - len(rtts)) / n * 100 if n else 0.0,
+               "min": None, "avg": None, "max": None, "p95": None}
+        if rtts:
+            out.update(min=rtts[0], max=rtts[-1], avg=sum(rtts) / len(rtts),
+                       p95=rtts[max(0, math.ceil(0.95 * len(rtts)) - 1)])
+        return out
+
+    def line(self):
+        st = self.summary()
+        text = f"sent={self.sent} recv={self.received} loss={st['loss']:.1f}%"
+        if st["min"] is not None:
+            text += "  min/avg/max/p95 = " + "/".join(f"{st[k] * 1000:.2f}" for k in ("min", "avg", "max", "p95")) + " ms"
+        return text + f"  (last {st['window']})"
+
+async def tcp_probe(ip, port, timeout):
+    """Time a TCP connect. Returns (rtt seconds or None, note). A refused connection still proves the host answered."""
+    import asyncio
+    t0 = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except ConnectionRefusedError:
+        return time.perf_counter() - t0, "refused"
+    except (asyncio.TimeoutError, OSError):
+        return None, None
+    rtt = time.perf_counter() - t0
+    writer.transport.abort()
+    return rtt, None
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(int.from_bytes(data[i:i + 2], "big") for i in range(0, len(data), 2))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def icmp_available():
+    """True if this process may open an unprivileged ICMP datagram socket (Linux ping_group_range, macOS)."""
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+async def icmp_probe(ip, seq, timeout):
+    """One ICMP echo over a datagram socket. The kernel routes replies by socket, so no raw socket is needed."""
+    import asyncio, struct
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    sock.setblocking(False)
+    seq &= 0xFFFF
+    payload = b"venom.console ping".ljust(32, b".")
+    pkt = struct.pack("!BBHHH", 8, 0, 0, 0, seq) + payload
+    pkt = struct.pack("!BBHHH", 8, 0, _icmp_checksum(pkt), 0, seq) + payload
+    try:
+        t0 = time.perf_counter()
+        await loop.sock_sendto(sock, pkt, (ip, 0))
+        while True:
+            remaining = t0 + timeout - time.perf_counter()
+            if remaining <= 0:
+                return None, None
+            data = await asyncio.wait_for(loop.sock_recv(sock, 2048), remaining)
+            if data and data[0] >> 4 == 4:
+                data = data[(data[0] & 0x0F) * 4:]   # macOS includes the IP header
+            if len(data) >= 8 and data[0] == 0 and struct.unpack("!H", data[6:8])[0] == seq:
+                return time.perf_counter() - t0, None
+    except (asyncio.TimeoutError, OSError):
+        return None, None
+    finally:
+        sock.close()
+
+async def run_pinger(targets, stats, count=0, interval=0.2, timeout=1.0, port=PING_PORT, icmp=False, quiet=False):
+    """Probe every target each interval until count rounds (0 = forever). Rounds are scheduled on
+    absolute times, so slow probes never stretch the interval. Results go into stats[target]."""
+    import asyncio
+    loop = asyncio.get_running_loop()
+    addrs = {}
+    for t in targets:
+        try:
+            infos = await loop.getaddrinfo(t, port, family=socket.AF_INET if icmp else 0, type=socket.SOCK_STREAM)
+            addrs[t] = infos[0][4][0]
+        except OSError as e:
+            print(f"{t}: cannot resolve ({e})")
+    if not addrs:
+        return
+    running = set()
+
+    async def probe(target, ip, seq):
+        rtt, note = await (icmp_probe(ip, seq, timeout) if icmp else tcp_probe(ip, port, timeout))
+        stats[target].add(rtt)
+        if not quiet:
+            if rtt is None:
+                print(f"{target} ({ip}): seq={seq} timeout")
+            else:
+                print(f"{target} ({ip}): seq={seq} time={rtt * 1000:.2f} ms" + (f" ({note})" if note else ""))
+
+    start, seq = loop.time(), 0
+    while count == 0 or seq < count:
+        for target, ip in addrs.items():
+            task = asyncio.create_task(probe(target, ip, seq))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        seq += 1
+        if count and seq >= count:
+            break
+        await asyncio.sleep(max(0.0, start + seq * interval - loop.time()))
+    if running:
+        await asyncio.gather(*running)
+
 def cmd_fastping(args=""):
-    target = args.strip() or input("Target for fastping: ").strip()
-    if not target: return
-    cnt_text = input("Number of pings (0=infinite, default 0): ").strip() or "0"
-    interval_text = input("Interval seconds (default 0.2): ").strip() or "0.2"
+    """fastping <host>[,host...] [-c N] [-i sec] [--port 443] [--icmp] [--timeout sec] [--window N] [--quiet]"""
+    import asyncio
+    pos, opts = parse_opts(args, flags=("--icmp", "--quiet", "-q"),
+                           options=("-c", "--count", "-i", "--interval", "--port", "-p", "--timeout", "-w", "--window"))
+    targets = [t for p in pos for t in p.split(",") if t]
+    if not targets:
+        targets = [t for t in input("Target for fastping: ").replace(",", " ").split() if t]
+    if not targets: return
+    if opts:
+        cnt_text = opts.get("c") or opts.get("count") or "0"
+        interval_text = opts.get("i") or opts.get("interval") or "0.2"
+    else:
+        cnt_text = input("Number of pings (0=infinite, default 0): ").strip() or "0"
+        interval_text = input("Interval seconds (default 0.2): ").strip() or "0.2"
     try: cnt = int(cnt_text)
     except: cnt = 0
-    try: interval = float(interval_text)
+    try: interval = max(0.001, float(interval_text))
     except: interval = 0.2
-    print(f"Pinging {target} every {interval}s. Press Ctrl+C to stop.")
-    n = 0
+    try: timeout = float(opts.get("timeout") or opts.get("w") or "1")
+    except ValueError: timeout = 1.0
+    port = opt_int(opts, "port", opt_int(opts, "p", PING_PORT))
+    icmp = bool(opts.get("icmp"))
+    if icmp and not icmp_available():
+        print("Unprivileged ICMP sockets are not permitted here; using TCP connect timing instead.")
+        icmp = False
+    stats = {t: PingStats(max(1, opt_int(opts, "window", PING_WINDOW))) for t in targets}
+    mode = "ICMP echo" if icmp else f"TCP connect :{port}"
+    print(f"Pinging {', '.join(targets)} every {interval}s ({mode}). Press Ctrl+C to stop.")
     try:
-        while cnt == 0 or n < cnt:
-            subprocess.run(f"ping -n 1 {target}", shell=True)
-            n += 1
-            time.sleep(interval)
+        asyncio.run(run_pinger(targets, stats, cnt, interval, timeout, port, icmp, bool(opts.get("quiet") or opts.get("q"))))
     except KeyboardInterrupt:
         print("\nFastping stopped.")
+    for t, st in stats.items():
+        if st.sent:
+            print(f"{t}: {st.line()}")
 
 def cmd_tracert(args=""):
     host = args.strip() or input("Host for tracert: ").strip()
@@ -614,52 +1030,211 @@ def cmd_ns(args=""):
     if not target: return
     run_and_print(f"nslookup {target}")
 
+# ---- bulk DNS with an in-memory TTL cache (get-ip / ipsearch) ----
+DNS_TTL = 300        # seconds a successful lookup is reused
+DNS_NEG_TTL = 30     # seconds a failed lookup is reused (negative cache)
+DNS_JOBS = 32
+
+class DnsCache:
+    """Thread-safe {key: (expires, result, error)} shared by every command in this session."""
+
+    def __init__(self):
+        import threading
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(result, error) for a live entry, else None."""
+        with self._lock:
+            hit = self.entries.get(key)
+            if hit and hit[0] > time.monotonic():
+                return hit[1], hit[2]
+            self.entries.pop(key, None)
+            return None
+
+    def put(self, key, result, error):
+        ttl = DNS_NEG_TTL if error else DNS_TTL
+        with self._lock:
+            self.entries[key] = (time.monotonic() + ttl, result, error)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+DNS_CACHE = DnsCache()
+
+def dns_lookup(name, reverse=False):
+    """gethostbyname_ex (or gethostbyaddr with reverse) through DNS_CACHE.
+    Returns (result tuple or None, error or None, latency seconds, cached)."""
+    key = ("PTR" if reverse else "A", name.lower())
+    t0 = time.perf_counter()
+    hit = DNS_CACHE.get(key)
+    if hit:
+        return hit[0], hit[1], time.perf_counter() - t0, True
+    try:
+        result, error = (socket.gethostbyaddr if reverse else socket.gethostbyname_ex)(name), None
+    except (socket.gaierror, socket.herror, ValueError) as e:
+        # ValueError covers UnicodeError from the idna codec ('a..com', labels over 63 chars)
+        result, error = None, e
+    except OSError as e:
+        # transient failures (no network, interrupted) are not cached
+        return None, e, time.perf_counter() - t0, False
+    DNS_CACHE.put(key, result, error)
+    return result, error, time.perf_counter() - t0, False
+
+def _dns_target(text):
+    """Reduce an email address, URL or host:port to the bare host name."""
+    text = text.strip()
+    if "@" in text:
+        text = text.split("@")[1]
+    if "://" in text:
+        text = text.split("://")[1]
+    if "/" in text:
+        text = text.split("/")[0]
+    if ":" in text:
+        text = text.split(":")[0]
+    return text.strip()
+
+def _read_names(path):
+    """First field of each non-blank, non-comment line of a hosts/IPs file."""
+    names = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.split("#", 1)[0].replace(",", " ").strip()
+            if line:
+                names.append(line.split()[0])
+    return names
+
+def resolve_many(names, reverse=False, jobs=DNS_JOBS, progress=True):
+    """Resolve names on a bounded thread pool; each distinct name is looked up once.
+    Returns rows in input order: dict(query, status, hostname, addresses, latency_ms, cached, error)."""
+    from concurrent.futures import ThreadPoolExecutor
+    unique = list(dict.fromkeys(names))
+    meter = Progress(len(unique), enabled=progress, unit="names")
+
+    def one(name):
+        result, error, latency, cached = dns_lookup(name, reverse)
+        meter.add(1)
+        return name, result, error, latency, cached
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        try:
+            done = {r[0]: r for r in pool.map(one, unique)}
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            meter.clear()
+    rows = []
+    for name in names:
+        _, result, error, latency, cached = done[name]
+        if result:
+            hostname, _, addrs = result
+            rows.append({"query": name, "status": "ok", "hostname": hostname, "addresses": " ".join(addrs),
+                         "latency_ms": round(latency * 1000, 2), "cached": cached, "error": ""})
+        else:
+            rows.append({"query": name, "status": "error", "hostname": "", "addresses": "",
+                         "latency_ms": round(latency * 1000, 2), "cached": cached, "error": str(error)})
+    return rows, meter.elapsed()
+
+def _dns_bulk(path, opts, reverse=False):
+    """Shared --file mode of get-ip and ipsearch: resolve every line, write CSV or JSON."""
+    import csv, io, json, ipaddress
+    path = resolve_path(path)
+    try:
+        names = _read_names(path)
+    except OSError as e:
+        print("Cannot read", path, "-", e); return
+    if not reverse:
+        names = [n for n in (_dns_target(n) for n in names) if n]
+    if not names:
+        print("No names in", path); return
+    invalid = []
+    if reverse:
+        for n in names:
+            try:
+                ipaddress.ip_address(n)
+            except ValueError:
+                invalid.append(n)
+    fmt = (opts.get("format") or opts.get("f") or "csv").lower()
+    if fmt not in ("csv", "json"):
+        print("Unsupported format. Use csv or json."); return
+    out = opts.get("out") or opts.get("o")
+    jobs = opt_int(opts, "jobs", opt_int(opts, "j", DNS_JOBS))
+    bad = set(invalid)
+    try:
+        rows, secs = resolve_many([n for n in names if n not in bad], reverse, jobs, progress=bool(out))
+    except KeyboardInterrupt:
+        print("\nLookup interrupted.")
+        return
+    rows += [{"query": n, "status": "invalid", "hostname": "", "addresses": "", "latency_ms": 0.0,
+              "cached": False, "error": "not an IP address"} for n in invalid]
+    if fmt == "json":
+        text = json.dumps(rows, indent=2) + "\n"
+    else:
+        buf = io.StringIO()
+        w = csv.DictWriter(buf, fieldnames=["query", "status", "hostname", "addresses", "latency_ms", "cached", "error"],
+                           lineterminator="\n")
+        w.writeheader()
+        w.writerows(rows)
+        text = buf.getvalue()
+    if out:
+        out = resolve_path(out)
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        print("Wrote", out)
+    else:
+        print(text, end="")
+    ok = sum(1 for r in rows if r["status"] == "ok")
+    cached = sum(1 for r in rows if r["cached"])
+    print(f"{len(rows)} lookup(s): {ok} resolved, {len(rows) - ok} failed, {cached} from cache, "
+          f"in {secs:.2f}s ({len(rows) / secs:.0f}/s)")
+
 def cmd_get_ip(args=""):
-    """Resolve domain/website/email to IP address(es)."""
-    target = args.strip() or input("Domain, website, or email to resolve: ").strip()
+    """Resolve domain/website/email to IP address(es).
+    get-ip --file hosts.txt [--format csv|json] [--out file] [--jobs N] resolves a whole list concurrently."""
+    pos, opts = parse_opts(args, options=("--file", "--format", "-f", "--out", "-o", "--jobs", "-j"))
+    if opts.get("file"):
+        _dns_bulk(opts["file"], opts)
+        return
+    target = " ".join(pos) or input("Domain, website, or email to resolve: ").strip()
     if not target:
         return
     
-    # Extract domain from email (user@domain.com -> domain.com)
-    if "@" in target:
-        target = target.split("@")[1]
-    
-    # Extract domain from URL (https://example.com/path -> example.com)
-    if "://" in target:
-        target = target.split("://")[1]
-    if "/" in target:
-        target = target.split("/")[0]
-    
-    # Remove port if present (example.com:8080 -> example.com)
-    if ":" in target:
-        target = target.split(":")[0]
-    
-    target = target.strip()
+    # user@domain.com, https://example.com/path and example.com:8080 -> bare host
+    target = _dns_target(target)
     if not target:
         print("Invalid input.")
         return
     
-    try:
-        # Try to get all IP addresses
-        hostname, aliaslist, ipaddrlist = socket.gethostbyname_ex(target)
-        print(f"Hostname: {hostname}")
-        if aliaslist:
-            print(f"Aliases: {', '.join(aliaslist)}")
-        print(f"IP Address(es):")
-        for ip in ipaddrlist:
-            print(f"  {ip}")
-    except socket.gaierror as e:
-        print(f"Could not resolve '{target}': {e}")
-    except Exception as e:
-        print(f"Error resolving '{target}': {e}")
+    result, error, latency, cached = dns_lookup(target)
+    if isinstance(error, socket.gaierror):
+        print(f"Could not resolve '{target}': {error}")
+        return
+    if error:
+        print(f"Error resolving '{target}': {error}")
+        return
+    hostname, aliaslist, ipaddrlist = result
+    print(f"Hostname: {hostname}")
+    if aliaslist:
+        print(f"Aliases: {', '.join(aliaslist)}")
+    print(f"IP Address(es):")
+    for ip in ipaddrlist:
+        print(f"  {ip}")
+    print(f"({latency * 1000:.1f} ms{', cached' if cached else ''})")
 
 def cmd_ip(args=""):
     """Alias for get-ip command."""
     cmd_get_ip(args)
 
 def cmd_ipsearch(args=""):
-    """Reverse IP lookup - find domains/websites associated with an IP address."""
-    ip = args.strip() or input("IP address to search: ").strip()
+    """Reverse IP lookup - find domains/websites associated with an IP address.
+    ipsearch --file ips.txt [--format csv|json] [--out file] [--jobs N] looks up a whole list concurrently."""
+    pos, opts = parse_opts(args, options=("--file", "--format", "-f", "--out", "-o", "--jobs", "-j"))
+    if opts.get("file"):
+        _dns_bulk(opts["file"], opts, reverse=True)
+        return
+    ip = " ".join(pos) or input("IP address to search: ").strip()
     if not ip:
         return
     
@@ -669,68 +1244,582 @@ def cmd_ipsearch(args=""):
         print(f"'{ip}' is not a valid IP address.")
         return
     
-    try:
-        # Try reverse DNS lookup
-        hostname, aliaslist, ipaddrlist = socket.gethostbyaddr(ip)
-        print(f"IP Address: {ip}")
-        print(f"Hostname: {hostname}")
-        if aliaslist:
-            print(f"Aliases: {', '.join(aliaslist)}")
-        print(f"Resolved IPs: {', '.join(ipaddrlist)}")
-    except socket.herror:
+    result, error, latency, cached = dns_lookup(ip, reverse=True)
+    if isinstance(error, socket.herror):
         print(f"No hostname found for IP address: {ip}")
-    except Exception as e:
-        print(f"Error searching IP '{ip}': {e}")
+        return
+    if error:
+        print(f"Error searching IP '{ip}': {error}")
+        return
+    hostname, aliaslist, ipaddrlist = result
+    print(f"IP Address: {ip}")
+    print(f"Hostname: {hostname}")
+    if aliaslist:
+        print(f"Aliases: {', '.join(aliaslist)}")
+    print(f"Resolved IPs: {', '.join(ipaddrlist)}")
+    print(f"({latency * 1000:.1f} ms{', cached' if cached else ''})")
+
+# ---- network snapshot (netinfo / saveinfo) ----
+NETINFO_DEADLINE = 20.0    # seconds for the whole snapshot, all collectors together
+NETINFO_VOLATILE = {"rx_bytes", "tx_bytes", "rx_packets", "tx_packets", "rx_errors", "tx_errors",
+                    "rx_dropped", "tx_dropped", "sockets"}   # ignored by saveinfo --diff
+NETINFO_WINDOWS = {
+    "ipconfig": "ipconfig /all", "wlan_interfaces": "netsh wlan show interfaces",
+    "wlan_profiles": "netsh wlan show profiles", "arp": "arp -a", "routes": "route print",
+    "dns_cache": "ipconfig /displaydns", "whoami": "whoami",
+}
+NETINFO_POSIX = {"interfaces": "ifconfig -a", "routes": "netstat -rn", "arp": "arp -an"}
+
+def _read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _hex_ipv4(h):
+    """/proc/net little-endian hex address -> dotted quad."""
+    import struct
+    return socket.inet_ntoa(struct.pack("<I", int(h, 16)))
+
+def _ifaddr(name, request):
+    """IPv4 address or netmask of an interface via ioctl (SIOCGIFADDR / SIOCGIFNETMASK)."""
+    import fcntl, struct
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            res = fcntl.ioctl(s.fileno(), request, struct.pack("256s", name.encode()[:15]))
+        return socket.inet_ntoa(res[20:24])
+    except OSError:
+        return None
+
+def proc_interfaces():
+    """Interfaces from /sys/class/net plus addresses (ioctl for IPv4, /proc/net/if_inet6 for IPv6)."""
+    base = "/sys/class/net"
+    v6 = {}
+    for line in (_read_text("/proc/net/if_inet6") or "").splitlines():
+        f = line.split()
+        if len(f) >= 6:
+            addr = ":".join(f[0][i:i + 4] for i in range(0, 32, 4))
+            v6.setdefault(f[5], []).append(f"{socket.inet_ntop(socket.AF_INET6, socket.inet_pton(socket.AF_INET6, addr))}/{int(f[2], 16)}")
+    out = []
+    for name in sorted(os.listdir(base)):
+        attr = lambda k: (_read_text(os.path.join(base, name, k)) or "").strip()
+        rec = {"name": name, "mac": attr("address"), "state": attr("operstate"), "mtu": int(attr("mtu") or 0),
+               "ipv4": _ifaddr(name, 0x8915), "netmask": _ifaddr(name, 0x891B), "ipv6": v6.get(name, [])}
+        for k in ("rx_bytes", "tx_bytes", "rx_packets", "tx_packets", "rx_errors", "tx_errors", "rx_dropped", "tx_dropped"):
+            rec[k] = int(attr(f"statistics/{k}") or 0)
+        out.append(rec)
+    return out
+
+def proc_routes():
+    """IPv4 routing table from /proc/net/route."""
+    out = []
+    for line in (_read_text("/proc/net/route") or "").splitlines()[1:]:
+        f = line.split()
+        if len(f) >= 8:
+            out.append({"dest": _hex_ipv4(f[1]), "gateway": _hex_ipv4(f[2]), "mask": _hex_ipv4(f[7]),
+                        "iface": f[0], "metric": int(f[6]), "flags": int(f[3], 16)})
+    return out
+
+def proc_arp():
+    """Neighbour table from /proc/net/arp (incomplete entries skipped)."""
+    out = []
+    for line in (_read_text("/proc/net/arp") or "").splitlines()[1:]:
+        f = line.split()
+        if len(f) >= 6 and f[3] != "00:00:00:00:00:00":
+            out.append({"ip": f[0], "mac": f[3], "iface": f[5], "flags": f[2]})
+    return out
+
+def _resolv_conf():
+    conf = {"nameservers": [], "search": []}
+    for line in (_read_text("/etc/resolv.conf") or "").splitlines():
+        f = line.split()
+        if len(f) >= 2 and f[0] == "nameserver":
+            conf["nameservers"].append(f[1])
+        elif f and f[0] in ("search", "domain"):
+            conf["search"] += f[1:]
+    return conf
+
+def _proc_wireless():
+    out = []
+    for line in (_read_text("/proc/net/wireless") or "").splitlines()[2:]:
+        name, _, rest = line.partition(":")
+        f = rest.split()
+        if len(f) >= 3:
+            out.append({"name": name.strip(), "link": float(f[1].rstrip(".")), "level": float(f[2].rstrip("."))})
+    return out
+
+def _proc_sockstat():
+    out = {}
+    for line in (_read_text("/proc/net/sockstat") or "").splitlines():
+        proto, _, rest = line.partition(":")
+        f = rest.split()
+        out[proto] = {f[i]: int(f[i + 1]) for i in range(0, len(f) - 1, 2)}
+    return out
+
+def _whoami():
+    import getpass
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "unknown"
+    return {"user": user, "hostname": socket.gethostname()}
+
+def netinfo_collectors(deadline=NETINFO_DEADLINE):
+    """{section: zero-arg callable} for this platform. Command-based sections return {'text': output}
+    and give their command at most deadline seconds."""
+    collectors = {"whoami": _whoami, "public_ip": lambda: {"ip": get_public_ip()}}
+    if IS_WINDOWS:
+        commands = NETINFO_WINDOWS
+    elif os.path.isdir("/sys/class/net") and os.path.exists("/proc/net/route"):
+        collectors.update(interfaces=proc_interfaces, routes=proc_routes, arp=proc_arp, dns=_resolv_conf,
+                          wifi=_proc_wireless, sockets=_proc_sockstat)
+        return collectors
+    else:
+        commands = NETINFO_POSIX
+    for name, cmd in commands.items():
+        collectors[name] = lambda cmd=cmd: {"text": (lambda o, e, rc: o or e)(*run_quiet(cmd, timeout=deadline))}
+    return collectors
+
+def take_snapshot(deadline=NETINFO_DEADLINE):
+    """Run every collector concurrently; sections still running at the deadline are recorded as timed out."""
+    from concurrent.futures import ThreadPoolExecutor, wait
+    collectors = netinfo_collectors(deadline)
+    t0 = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=len(collectors))
+    futures = {pool.submit(fn): name for name, fn in collectors.items()}
+    done, _ = wait(futures, timeout=deadline)
+    pool.shutdown(wait=False, cancel_futures=True)
+    sections = {}
+    for fut, name in futures.items():
+        if fut not in done:
+            sections[name] = {"error": f"timed out after {deadline:g}s"}
+        elif fut.exception():
+            sections[name] = {"error": str(fut.exception())}
+        else:
+            sections[name] = fut.result()
+    return {"taken": datetime.datetime.now().isoformat(timespec="seconds"), "host": socket.gethostname(),
+            "platform": sys.platform, "elapsed": round(time.perf_counter() - t0, 3),
+            "sections": {k: sections[k] for k in sorted(sections)}}
+
+def _fmt_value(v):
+    if isinstance(v, dict):
+        return " ".join(f"{k}={x}" for k, x in v.items()) or "-"
+    if isinstance(v, list):
+        return ", ".join(map(str, v)) or "-"
+    return "-" if v is None or v == "" else str(v)
+
+def snapshot_text(snap):
+    """Human-readable view of a snapshot: tables for record lists, key: value for mappings."""
+    lines = [f"Network snapshot of {snap['host']} at {snap['taken']} ({snap['elapsed']:.2f}s)"]
+    for name, data in snap["sections"].items():
+        lines.append(f"\n=== {name} ===")
+        if isinstance(data, dict) and "text" in data:
+            lines.append(data["text"].rstrip())
+        elif isinstance(data, list) and data and isinstance(data[0], dict):
+            keys = list(data[0])
+            rows = [[_fmt_value(r.get(k)) for k in keys] for r in data]
+            widths = [max(len(k), *(len(r[i]) for r in rows)) for i, k in enumerate(keys)]
+            lines.append("  ".join(k.ljust(w) for k, w in zip(keys, widths)).rstrip())
+            lines += ["  ".join(c.ljust(w) for c, w in zip(r, widths)).rstrip() for r in rows]
+        elif isinstance(data, dict):
+            lines += [f"{k}: {_fmt_value(v)}" for k, v in data.items()]
+        else:
+            lines.append(_fmt_value(data))
+    return "\n".join(lines) + "\n"
+
+def _flatten(data, prefix=""):
+    """Nested sections -> {path: value}; list items are keyed by their name/ip/dest when they have one."""
+    out = {}
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k not in NETINFO_VOLATILE:
+                out.update(_flatten(v, f"{prefix}.{k}" if prefix else k))
+    elif isinstance(data, list) and data and all(isinstance(x, dict) for x in data):
+        for i, item in enumerate(data):
+            ident = item.get("name") or item.get("ip") or (item.get("dest") and f"{item['dest']}/{item.get('mask')}@{item.get('iface')}") or i
+            out.update(_flatten(item, f"{prefix}[{ident}]"))
+    elif isinstance(data, str) and "\n" in data:
+        for i, line in enumerate(data.splitlines()):
+            if line.strip():
+                out[f"{prefix}:{line.strip()}"] = True   # text sections compare as sets of lines
+    else:
+        out[prefix] = data
+    return out
+
+def _record_key(key):
+    """'section[ident]' prefix of a flattened list-item key; None for plain values and text-section lines."""
+    start = key.find("[")
+    if start < 0 or ":" in key[:start]:
+        return None
+    end = key.find("]", start)
+    return key[:end + 1] if end > 0 else None
+
+def snapshot_diff(old, new):
+    """Lines describing what changed between two snapshots ('+' added, '-' removed, '~' changed)."""
+    a, b = _flatten(old.get("sections", {})), _flatten(new.get("sections", {}))
+    in_a, in_b = {_record_key(k) for k in a} - {None}, {_record_key(k) for k in b} - {None}
+    lines, shown = [], set()
+    for key in sorted(a.keys() | b.keys()):
+        rec = _record_key(key)
+        if rec and (rec not in in_a or rec not in in_b):
+            # whole record appeared or vanished: one line with all its fields
+            if rec not in shown:
+                shown.add(rec)
+                src, sign = (b, "+") if rec not in in_a else (a, "-")
+                fields = " ".join(f"{k[len(rec) + 1:]}={_fmt_value(v)}" for k, v in sorted(src.items()) if _record_key(k) == rec)
+                lines.append(f"{sign} {rec} {fields}")
+        elif key not in a:
+            lines.append(f"+ {key}" + ("" if b[key] is True else f" = {_fmt_value(b[key])}"))
+        elif key not in b:
+            lines.append(f"- {key}" + ("" if a[key] is True else f" = {_fmt_value(a[key])}"))
+        elif a[key] != b[key]:
+            lines.append(f"~ {key}: {_fmt_value(a[key])} -> {_fmt_value(b[key])}")
+    return lines
 
 def cmd_netinfo(args=""):
+    """netinfo [--json] [--deadline S] — concurrent snapshot of interfaces, routes, ARP, DNS, Wi-Fi, user."""
+    import json
+    pos, opts = parse_opts(args, flags=("--json",), options=("--deadline",))
     print("Showing network info (no passwords).")
-    cmds = ["ipconfig /all", "netsh wlan show interfaces", "netsh wlan show profiles", "arp -a", "route print", "ipconfig /displaydns", "whoami"]
     try:
-        for c in cmds:
-            print("\n=== ", c, " ===")
-            run_and_print(c)
+        snap = take_snapshot(float(opts.get("deadline") or NETINFO_DEADLINE))
+    except ValueError:
+        print("Invalid deadline."); return
     except KeyboardInterrupt:
-        print("\nInterrupted.")
+        print("\nInterrupted."); return
+    print(json.dumps(snap, indent=2) if opts.get("json") else snapshot_text(snap))
 
 def cmd_saveinfo(args=""):
+    """saveinfo [--deadline S] — save a snapshot as JSON + text. saveinfo --diff <old.json> [new.json] shows changes."""
+    import json
+    pos, opts = parse_opts(args, options=("--diff", "--deadline"))
+    try:
+        deadline = float(opts.get("deadline") or NETINFO_DEADLINE)
+    except ValueError:
+        print("Invalid deadline."); return
+    if opts.get("diff"):
+        try:
+            with open(resolve_path(opts["diff"]), "r", encoding="utf-8") as f:
+                old = json.load(f)
+            if pos:
+                with open(resolve_path(" ".join(pos)), "r", encoding="utf-8") as f:
+                    new = json.load(f)
+            else:
+                new = take_snapshot(deadline)
+        except (OSError, ValueError) as e:
+            print("saveinfo failed:", e); return
+        changes = snapshot_diff(old, new)
+        print(f"Changes from {old.get('taken', '?')} to {new.get('taken', '?')}:")
+        print("\n".join(changes) if changes else "  (no changes)")
+        return
     ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    out = os.path.join(tempfile.gettempdir(), f"venom_netinfo_{ts}.txt")
-    try:
-        with open(out, "w", encoding="utf-8", errors="replace") as f:
-            cmds = ["ipconfig /all", "netsh wlan show interfaces", "netsh wlan show profiles", "arp -a", "route print", "ipconfig /displaydns", "whoami"]
-            for c in cmds:
-                f.write(f"=== {c} ===\n")
-                outp, err, rc = run_quiet(c, timeout=20)
-                f.write((outp or err) + "\n\n")
-        print("Saved to", out)
+    out = os.path.join(tempfile.gettempdir(), f"venom_netinfo_{ts}")
+    try:
+        snap = take_snapshot(deadline)
+        with open(out + ".json", "w", encoding="utf-8") as f:
+            json.dump(snap, f, indent=2)
+        with open(out + ".txt", "w", encoding="utf-8", errors="replace") as f:
+            f.write(snapshot_text(snap))
+        print(f"Saved to {out}.json and {out}.txt ({snap['elapsed']:.2f}s)")
     except Exception as e:
         print("saveinfo failed:", e)
 
 def cmd_wifi(args=""):
     run_and_print("netsh wlan show interfaces")
 
-def cmd_speedtest(args=""):
-    if shutil.which("speedtest-cli"):
-        run_and_print("speedtest-cli")
-    elif shutil.which("speedtest"):
-        run_and_print("speedtest")
-    else:
-        print("No speedtest CLI installed. Install 'speedtest-cli' or 'speedtest'.")
-
 def cmd_dnsflush(args=""):
+    DNS_CACHE.clear()
     run_and_print("ipconfig /flushdns")
 
 def cmd_hostname(args=""):
     print(socket.gethostname())
 
+# ---- socket table (netstat / ports / arp) ----
+TCP_STATES = {1: "ESTABLISHED", 2: "SYN_SENT", 3: "SYN_RECV", 4: "FIN_WAIT1", 5: "FIN_WAIT2", 6: "TIME_WAIT",
+              7: "CLOSE", 8: "CLOSE_WAIT", 9: "LAST_ACK", 10: "LISTEN", 11: "CLOSING"}
+STATE_ALIASES = {"LISTENING": "LISTEN", "SYN_RECEIVED": "SYN_RECV", "FIN_WAIT_1": "FIN_WAIT1",
+                 "FIN_WAIT_2": "FIN_WAIT2", "CLOSED": "CLOSE", "UNCONN": "UNCONN"}
+NETSTAT_FLAGS = ("--group", "-g", "--no-pid")
+NETSTAT_OPTIONS = ("--state", "-s", "--port", "-p", "--pid", "--proto", "--watch", "-w")
+
+def _proc_addr(text):
+    """'0100007F:0050' or 32-hex IPv6 form from /proc/net/* -> (ip, port)."""
+    import struct
+    addr, port = text.split(":")
+    if len(addr) == 8:
+        return _hex_ipv4(addr), int(port, 16)
+    raw = b"".join(struct.pack("<I", int(addr[i:i + 8], 16)) for i in range(0, 32, 8))
+    ip = socket.inet_ntop(socket.AF_INET6, raw)
+    return ip[7:] if ip.startswith("::ffff:") and "." in ip else ip, int(port, 16)
+
+def _socket_pids():
+    """{socket inode: pid} from /proc/<pid>/fd links (only processes we may inspect)."""
+    owners = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                link = os.readlink(f"{fd_dir}/{fd}")
+            except OSError:
+                continue
+            if link.startswith("socket:["):
+                owners[int(link[8:-1])] = int(pid)
+    return owners
+
+def proc_sockets(pids=True):
+    """TCP/UDP sockets from /proc/net/{tcp,tcp6,udp,udp6} as dicts
+    (proto, local, lport, remote, rport, state, pid)."""
+    owners = _socket_pids() if pids else {}
+    out = []
+    for proto in ("tcp", "tcp6", "udp", "udp6"):
+        try:
+            f = open(f"/proc/net/{proto}", "r", encoding="ascii", errors="replace")
+        except OSError:
+            continue
+        with f:
+            next(f, None)
+            for line in f:
+                p = line.split()
+                if len(p) < 10:
+                    continue
+                local, lport = _proc_addr(p[1])
+                remote, rport = _proc_addr(p[2])
+                st = int(p[3], 16)
+                state = TCP_STATES.get(st, str(st)) if proto.startswith("tcp") else ("UNCONN" if st == 7 else "ESTABLISHED")
+                out.append({"proto": proto[:3], "local": local, "lport": lport, "remote": remote, "rport": rport,
+                            "state": state, "pid": owners.get(int(p[9]))})
+    return out
+
+WIN_TCP_STATES = {1: "CLOSE", 2: "LISTEN", 3: "SYN_SENT", 4: "SYN_RECV", 5: "ESTABLISHED", 6: "FIN_WAIT1",
+                  7: "FIN_WAIT2", 8: "CLOSE_WAIT", 9: "CLOSING", 10: "LAST_ACK", 11: "TIME_WAIT", 12: "DELETE_TCB"}
+# row layouts of the *_OWNER_PID tables; addresses/ports are in network byte order
+WIN_SOCKET_ROWS = {("tcp", False): "<6I", ("tcp", True): "<16sII16sIIII",
+                   ("udp", False): "<3I", ("udp", True): "<16sIII"}
+
+def _iphlp_table(fn, *args):
+    """Raw bytes of an iphlpapi Get*Table call (buffer, size, order, *args), growing the buffer as asked."""
+    import ctypes
+    size = ctypes.c_ulong(0)
+    for _ in range(8):
+        buf = ctypes.create_string_buffer(max(size.value, 4))
+        rc = fn(buf, ctypes.byref(size), False, *args)
+        if rc == 0:
+            return buf.raw
+        if rc != 122:   # ERROR_INSUFFICIENT_BUFFER: size now holds what is needed
+            raise OSError(rc, f"iphlpapi error {rc}")
+    raise OSError("iphlpapi table kept growing")
+
+def _win_socket_rows(raw, proto, v6):
+    """Parse a MIB_{TCP,UDP}[6]TABLE_OWNER_PID buffer into proc_sockets-style records."""
+    import struct
+    fmt = WIN_SOCKET_ROWS[(proto, v6)]
+    size = struct.calcsize(fmt)
+    port = lambda v: ((v & 0xFF) << 8) | ((v >> 8) & 0xFF)
+    addr = (lambda a: socket.inet_ntop(socket.AF_INET6, a)) if v6 else (lambda a: socket.inet_ntoa(struct.pack("<I", a)))
+    out = []
+    for i in range(struct.unpack_from("<I", raw)[0]):
+        f = struct.unpack_from(fmt, raw, 4 + i * size)
+        if proto == "tcp":
+            if v6:
+                local, _, lport, remote, _, rport, state, pid = f
+            else:
+                state, local, lport, remote, rport, pid = f
+            rec = {"proto": "tcp", "local": addr(local), "lport": port(lport), "remote": addr(remote),
+                   "rport": port(rport), "state": WIN_TCP_STATES.get(state, str(state)), "pid": pid}
+        else:
+            local, lport, pid = (f[0], f[2], f[3]) if v6 else f
+            rec = {"proto": "udp", "local": addr(local), "lport": port(lport), "remote": "*", "rport": 0,
+                   "state": "UNCONN", "pid": pid}
+        out.append(rec)
+    return out
+
+def win_sockets(pids=True):
+    """TCP/UDP sockets from GetExtendedTcpTable/GetExtendedUdpTable. States come as numbers,
+    so unlike 'netstat' output this does not depend on the Windows display language."""
+    import ctypes
+    api = ctypes.windll.iphlpapi
+    out = []
+    for proto, fn, table_class in (("tcp", api.GetExtendedTcpTable, 5), ("udp", api.GetExtendedUdpTable, 1)):
+        for af, v6 in ((socket.AF_INET, False), (socket.AF_INET6, True)):
+            out += _win_socket_rows(_iphlp_table(fn, af, table_class, 0), proto, v6)
+    if not pids:
+        for rec in out:
+            rec["pid"] = None
+    return out
+
+def _win_arp_rows(raw):
+    """Parse a MIB_IPNETTABLE buffer into proc_arp-style records (invalid entries skipped)."""
+    import struct
+    out = []
+    for i in range(struct.unpack_from("<I", raw)[0]):
+        index, mac_len, mac, ip, kind = struct.unpack_from("<II8sII", raw, 4 + i * 24)
+        if kind == 2 or not any(mac[:mac_len]):
+            continue
+        out.append({"ip": socket.inet_ntoa(struct.pack("<I", ip)), "mac": mac[:mac_len].hex(":"),
+                    "iface": f"if{index}", "flags": {3: "dynamic", 4: "static"}.get(kind, str(kind))})
+    return out
+
+def win_arp():
+    """IPv4 neighbour table from GetIpNetTable."""
+    import ctypes
+    return _win_arp_rows(_iphlp_table(ctypes.windll.iphlpapi.GetIpNetTable))
+
+def _split_hostport(text):
+    host, _, port = text.rpartition(":")
+    return host.strip("[]"), int(port) if port.isdigit() else 0
+
+def netstat_sockets():
+    """Fallback: parse 'netstat -ano' into the same records as proc_sockets. Fields are taken by
+    position; the state text is localized on non-English Windows, so a TCP socket without a remote
+    port counts as LISTEN whatever the word says."""
+    outp, err, rc = run_quiet("netstat -ano", timeout=60)
+    out = []
+    for line in outp.splitlines():
+        p = line.split()
+        if len(p) < 4 or p[0].upper() not in ("TCP", "UDP"):
+            continue
+        proto = p[0].lower()
+        local, lport = _split_hostport(p[1])
+        remote, rport = _split_hostport(p[2]) if p[2] != "*:*" else ("*", 0)
+        if proto == "tcp" and len(p) >= 5:
+            word = p[3].upper()
+            state = STATE_ALIASES.get(word, word if word in TCP_STATES.values() else "LISTEN" if rport == 0 else word)
+            pid = p[-1]
+        else:
+            state, pid = "UNCONN" if remote == "*" else "ESTABLISHED", p[-1]
+        out.append({"proto": proto, "local": local, "lport": lport, "remote": remote, "rport": rport,
+                    "state": state, "pid": int(pid) if pid.isdigit() else None})
+    return out
+
+def socket_table(pids=True):
+    """Sockets from /proc, the Windows IP helper API, or failing both the netstat command."""
+    if os.path.exists("/proc/net/tcp"):
+        return proc_sockets(pids)
+    if IS_WINDOWS:
+        try:
+            return win_sockets(pids)
+        except (OSError, AttributeError):
+            pass
+    return netstat_sockets()
+
+def filter_sockets(socks, opts):
+    """Apply --state (comma list), --port (local or remote), --pid and --proto filters."""
+    states = {STATE_ALIASES.get(s, s) for s in (opts.get("state") or opts.get("s") or "").upper().replace("-", "_").split(",") if s}
+    port = opt_int(opts, "port", opt_int(opts, "p", 0))
+    pid = opt_int(opts, "pid", 0)
+    proto = (opts.get("proto") or "").lower()[:3]
+    return [s for s in socks
+            if (not states or s["state"] in states) and (not port or port in (s["lport"], s["rport"]))
+            and (not pid or s["pid"] == pid) and (not proto or s["proto"] == proto)]
+
+def _endpoint(ip, port):
+    return f"[{ip}]:{port}" if ":" in ip else f"{ip}:{port}"
+
+def _socket_line(s):
+    return (f"{s['proto'].upper():<5} {_endpoint(s['local'], s['lport']):<40} {_endpoint(s['remote'], s['rport']):<40} "
+            f"{s['state']:<12} {s['pid'] if s['pid'] is not None else '-'}")
+
+def _is_unspecified(ip):
+    return ip in ("0.0.0.0", "::", "*")
+
+def _watch(sample, describe, interval, show=str):
+    """Re-sample {key: value} every interval seconds and print only what appeared, vanished or changed."""
+    prev = sample()
+    print(f"Watching {len(prev)} entries every {interval:g}s (Ctrl+C stops).")
+    try:
+        while True:
+            time.sleep(interval)
+            cur = sample()
+            stamp = datetime.datetime.now().strftime("%H:%M:%S")
+            for key in cur.keys() - prev.keys():
+                print(f"{stamp} + {describe(key, cur[key])}")
+            for key in prev.keys() - cur.keys():
+                print(f"{stamp} - {describe(key, prev[key])}")
+            for key in cur.keys() & prev.keys():
+                if cur[key] != prev[key]:
+                    print(f"{stamp} ~ {describe(key, prev[key])} -> {show(cur[key])}")
+            prev = cur
+    except KeyboardInterrupt:
+        print("\nWatch stopped.")
+
+def _netstat(args, listening=False):
+    pos, opts = parse_opts(args, flags=NETSTAT_FLAGS, options=NETSTAT_OPTIONS)
+    if pos:
+        print("Unknown arguments:", " ".join(pos)); return
+    if listening and not (opts.get("state") or opts.get("s")):
+        opts["state"] = "LISTEN,UNCONN"
+    need_pids = not opts.get("no_pid")
+    sample = lambda: filter_sockets(socket_table(need_pids), opts)
+    watch = opts.get("watch") or opts.get("w")
+    if watch:
+        try: interval = max(0.1, float(watch))
+        except ValueError: interval = 2.0
+        fields = ("proto", "local", "lport", "remote", "rport")
+        _watch(lambda: {tuple(s[f] for f in fields): (s["state"], s["pid"]) for s in sample()},
+               lambda k, v: _socket_line(dict(zip(fields, k), state=v[0], pid=v[1])),
+               interval, show=lambda v: f"{v[0]} {v[1] if v[1] is not None else '-'}")
+        return
+    socks = sample()
+    if opts.get("group") or opts.get("g"):
+        from collections import Counter
+        counts = Counter(s["remote"] for s in socks if not _is_unspecified(s["remote"]))
+        print(f"{'Count':>7}  Remote host")
+        for host, n in counts.most_common():
+            print(f"{n:>7}  {host}")
+        print(f"{len(counts)} remote host(s), {sum(counts.values())} connection(s)")
+        return
+    socks.sort(key=lambda s: (s["proto"], s["state"] != "LISTEN", s["lport"], s["remote"], s["rport"]))
+    lines = [f"{'Proto':<5} {'Local Address':<40} {'Foreign Address':<40} {'State':<12} PID"]
+    lines += [_socket_line(s) for s in socks]
+    print("\n".join(lines))
+    print(f"{len(socks)} socket(s)")
+
 def cmd_netstat(args=""):
-    run_and_print("netstat -ano")
+    """netstat [--state LISTEN,ESTABLISHED] [--port N] [--pid N] [--proto tcp|udp] [--group] [--watch SEC] [--no-pid]"""
+    _netstat(args)
 
 def cmd_arp(args=""):
-    run_and_print("arp -a")
+    """arp [--watch SEC] — neighbour table from /proc/net/arp or GetIpNetTable ('arp -a' where neither works)."""
+    pos, opts = parse_opts(args, options=("--watch", "-w"))
+    watch = opts.get("watch") or opts.get("w")
+    if os.path.exists("/proc/net/arp"):
+        table = proc_arp
+    elif IS_WINDOWS:
+        table = win_arp
+    else:
+        table = None
+    if table is not None:
+        try:
+            table()
+        except (OSError, AttributeError):
+            table = None
+    if table is None:
+        if watch:
+            print("arp --watch needs /proc/net/arp or the Windows IP helper API; showing 'arp -a' once.")
+        run_and_print("arp -a")
+        return
+    if watch:
+        try: interval = max(0.1, float(watch))
+        except ValueError: interval = 2.0
+        _watch(lambda: {(e["ip"], e["iface"]): e["mac"] for e in table()},
+               lambda k, mac: f"{k[0]:<40} {mac:<18} {k[1]}", interval)
+        return
+    entries = table()
+    print(f"{'Address':<40} {'HW address':<18} Iface")
+    for e in sorted(entries, key=lambda e: (e["iface"], e["ip"])):
+        print(f"{e['ip']:<40} {e['mac']:<18} {e['iface']}")
+    print(f"{len(entries)} entr{'y' if len(entries) == 1 else 'ies'}")
 
 def cmd_ports(args=""):
-    cmd_netstat(args)
+    """ports — listening TCP and bound UDP sockets; accepts the netstat filters."""
+    _netstat(args, listening=True)
 
 def cmd_users(args=""):
     run_and_print("net user")
@@ -739,32 +1828,670 @@ def cmd_users(args=""):
 def cmd_freeminecraft(args):
     print("https://eaglercraft.com/mc/1.12.2")
 
+# ---- keep-alive HTTP client with timing breakdown (http, download, speedtest) ----
+HTTP_TIMEOUT = 15
+HTTP_USER_AGENT = "venom.console"
+HTTP_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+class HttpPool:
+    """Idle keep-alive connections keyed by (scheme, host, port). Thread-safe.
+    New connections are opened by hand so DNS, TCP connect and the TLS handshake can be timed separately.
+    HTTP(S)_PROXY / the system proxy settings are honoured like urlopen does (http:// proxies only):
+    plain http goes through the proxy with absolute URLs, https through a CONNECT tunnel."""
+
+    def __init__(self, timeout=HTTP_TIMEOUT, verify=True):
+        import threading, ssl
+        from urllib.request import getproxies
+        self.timeout = timeout
+        self.idle = {}
+        self._lock = threading.Lock()
+        self.ctx = ssl.create_default_context()
+        if not verify:
+            self.ctx.check_hostname = False
+            self.ctx.verify_mode = ssl.CERT_NONE
+        self.proxies = getproxies()
+        self.opened = 0
+
+    def _proxy(self, scheme, host):
+        """(host, port, Proxy-Authorization value or None) of the proxy for this origin, or None."""
+        from urllib.parse import urlsplit, unquote
+        from urllib.request import proxy_bypass
+        url = self.proxies.get(scheme)
+        if not url:
+            return None
+        if "://" not in url:
+            url = "http://" + url
+        u = urlsplit(url)
+        if u.scheme != "http" or not u.hostname or proxy_bypass(host):
+            return None
+        auth = None
+        if u.username is not None:
+            cred = f"{unquote(u.username)}:{unquote(u.password or '')}".encode()
+            auth = "Basic " + base64.b64encode(cred).decode("ascii")
+        return u.hostname, u.port or 80, auth
+
+    def _tunnel(self, sock, host, port, auth):
+        """Send CONNECT host:port over sock (connected to the proxy) and check the reply."""
+        lines = [f"CONNECT {host}:{port} HTTP/1.1", f"Host: {host}:{port}"]
+        if auth:
+            lines.append(f"Proxy-Authorization: {auth}")
+        sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        reply = b""
+        while b"\r\n\r\n" not in reply:
+            chunk = sock.recv(4096)
+            if not chunk or len(reply) > 65536:
+                raise OSError("proxy closed the connection during CONNECT")
+            reply += chunk
+        status = reply.split(b"\r\n", 1)[0].decode("latin-1", "replace")
+        parts = status.split(None, 2)
+        if len(parts) < 2 or parts[1] != "200":
+            raise OSError(f"proxy refused CONNECT: {status}")
+
+    def get(self, scheme, host, port, timing):
+        """A connection for the origin; fresh ones record dns/connect/tls seconds in timing
+        (through a proxy: resolving and connecting to the proxy, the CONNECT counts as connect)."""
+        import http.client
+        key = (scheme, host, port)
+        with self._lock:
+            stack = self.idle.get(key)
+            if stack:
+                timing["reused"] = True
+                return stack.pop()
+        proxy = self._proxy(scheme, host)
+        t0 = time.perf_counter()
+        info = socket.getaddrinfo(*(proxy[:2] if proxy else (host, port)), type=socket.SOCK_STREAM)[0]
+        t1 = time.perf_counter()
+        sock = socket.socket(info[0], info[1], info[2])
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(info[4])
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if proxy and scheme == "https":
+                self._tunnel(sock, host, port, proxy[2])
+            t2 = time.perf_counter()
+            if scheme == "https":
+                sock = self.ctx.wrap_socket(sock, server_hostname=host)
+        except BaseException:
+            sock.close()
+            raise
+        t3 = time.perf_counter()
+        timing.update(dns=t1 - t0, connect=t2 - t1, tls=t3 - t2 if scheme == "https" else 0.0, reused=False)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.ctx)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        conn.sock = sock
+        # plain http through a proxy: requests carry the absolute URL (and credentials, if any)
+        conn.via_proxy = bool(proxy) and scheme == "http"
+        conn.proxy_auth = proxy[2] if conn.via_proxy else None
+        with self._lock:
+            self.opened += 1
+        return conn
+
+    def put(self, scheme, host, port, conn):
+        with self._lock:
+            self.idle.setdefault((scheme, host, port), []).append(conn)
+
+    def close(self):
+        with self._lock:
+            for stack in self.idle.values():
+                for conn in stack:
+                    conn.close()
+            self.idle.clear()
+
+def _split_url(url):
+    """'host[:port]/path' or full URL -> (scheme, host, port, path-with-query)."""
+    from urllib.parse import urlsplit
+    if "://" not in url:
+        url = "http://" + url
+    u = urlsplit(url)
+    if u.scheme not in ("http", "https") or not u.hostname:
+        raise ValueError(f"unsupported URL: {url}")
+    port = u.port or (443 if u.scheme == "https" else 80)
+    return u.scheme, u.hostname, port, (u.path or "/") + (f"?{u.query}" if u.query else "")
+
+def http_request(pool, method, url, headers=None, body=None, sink=None, expect=None):
+    """One request over a pooled connection. Returns (response, body bytes, timing).
+    timing has dns/connect/tls (0 when the connection was reused), ttfb and total in seconds.
+    With sink, the body is handed to sink(chunk) as it arrives instead of being returned.
+    With expect (a set of statuses), any other status closes the connection without reading the body.
+    A streamed request body must be passed as a zero-arg callable returning a fresh iterable, so the
+    retry after a stale keep-alive connection can send it again."""
+    import http.client
+    scheme, host, port, path = _split_url(url)
+    hdrs = {"User-Agent": HTTP_USER_AGENT, "Accept-Encoding": "identity"}
+    hdrs.update(headers or {})
+    for attempt in (0, 1):
+        timing = {"dns": 0.0, "connect": 0.0, "tls": 0.0}
+        t0 = time.perf_counter()
+        conn = pool.get(scheme, host, port, timing)
+        target, send_hdrs = path, hdrs
+        if conn.via_proxy:
+            authority = f"[{host}]" if ":" in host else host
+            target = f"http://{authority}{f':{port}' if port != 80 else ''}{path}"
+            if conn.proxy_auth:
+                send_hdrs = dict(hdrs, **{"Proxy-Authorization": conn.proxy_auth})
+        try:
+            t_send = time.perf_counter()
+            conn.request(method, target, body=body() if callable(body) else body, headers=send_hdrs)
+            resp = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if timing["reused"] and attempt == 0:
+                continue   # the server closed an idle keep-alive connection; retry on a fresh one
+            raise
+        except BaseException:
+            conn.close()
+            raise
+        timing["ttfb"] = time.perf_counter() - t_send
+        if expect and resp.status not in expect:
+            conn.close()
+            timing["total"] = time.perf_counter() - t0
+            return resp, b"", timing
+        try:
+            if sink is None:
+                data = resp.read()
+            else:
+                data = b""
+                while True:
+                    chunk = resp.read1(256 * 1024)   # whatever has arrived, so streamed bodies are not held back
+                    if not chunk:
+                        break
+                    sink(chunk)
+                resp.read()   # read1 leaves a fully consumed fixed-length response open; this closes it
+        except BaseException:
+            conn.close()
+            raise
+        timing["total"] = time.perf_counter() - t0
+        if resp.will_close:
+            conn.close()
+        else:
+            pool.put(scheme, host, port, conn)
+        return resp, data, timing
+
+def _timing_line(t):
+    parts = ["reused" if t.get("reused") else
+             f"dns {t['dns'] * 1000:.1f}  connect {t['connect'] * 1000:.1f}" + (f"  tls {t['tls'] * 1000:.1f}" if t["tls"] else "")]
+    parts.append(f"ttfb {t['ttfb'] * 1000:.1f}  total {t['total'] * 1000:.1f} ms")
+    return "  ".join(parts)
+
+def latency_histogram(samples, width=40):
+    """Text histogram of latencies (seconds) over HTTP_BUCKETS_MS, plus p50/p90/p99 lines."""
+    import bisect
+    ms = sorted(s * 1000 for s in samples)
+    if not ms:
+        return []
+    counts = [0] * (len(HTTP_BUCKETS_MS) + 1)
+    for v in ms:
+        counts[bisect.bisect_left(HTTP_BUCKETS_MS, v)] += 1
+    top = max(counts)
+    lines = []
+    for i, c in enumerate(counts):
+        if not c:
+            continue
+        label = f"<= {HTTP_BUCKETS_MS[i]} ms" if i < len(HTTP_BUCKETS_MS) else f"> {HTTP_BUCKETS_MS[-1]} ms"
+        lines.append(f"  {label:>11} {c:>7}  " + "#" * max(1, round(c / top * width)))
+    pct = lambda p: ms[min(len(ms) - 1, int(p / 100 * len(ms)))]
+    lines.append(f"  min {ms[0]:.2f}  p50 {pct(50):.2f}  p90 {pct(90):.2f}  p99 {pct(99):.2f}  max {ms[-1]:.2f} ms")
+    return lines
+
+def http_bench(url, total, concurrency, method="GET", timeout=HTTP_TIMEOUT, verify=True):
+    """Send total requests from concurrency threads sharing one keep-alive pool.
+    Returns (latencies, {status: count}, {error: count}, bytes, seconds, connections opened)."""
+    import threading
+    from collections import Counter
+    pool = HttpPool(timeout, verify)
+    lock = threading.Lock()
+    latencies, statuses, errors = [], Counter(), Counter()
+    state = {"next": 0, "bytes": 0, "stop": False}
+    meter = Progress(total, unit="requests")
+
+    def worker():
+        while True:
+            with lock:
+                if state["stop"] or state["next"] >= total:
+                    return
+                state["next"] += 1
+            try:
+                resp, data, t = http_request(pool, method, url)
+                with lock:
+                    latencies.append(t["total"])
+                    statuses[resp.status] += 1
+                    state["bytes"] += len(data)
+            except Exception as e:
+                with lock:
+                    errors[type(e).__name__] += 1
+            meter.add(1)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(concurrency, total)))]
+    for th in threads:
+        th.start()
+    try:
+        for th in threads:
+            while th.is_alive():
+                th.join(0.2)
+    except KeyboardInterrupt:
+        state["stop"] = True
+        raise
+    finally:
+        meter.clear()
+        pool.close()
+    return latencies, statuses, errors, state["bytes"], meter.elapsed(), pool.opened
+
 def cmd_http(args=""):
-    url = args.strip() or input("URL (e.g. https://example.com): ").strip()
+    """http <url> [-X METHOD] [--repeat N] [--insecure] — request with DNS/connect/TLS/TTFB/total timing.
+    http <url> --bench [-n 1000] [-c 32] [-X GET] — concurrent keep-alive load test with latency histogram."""
+    pos, opts = parse_opts(args, flags=("--bench", "--insecure", "-k"),
+                           options=("-X", "--method", "-n", "-c", "--repeat", "--timeout"))
+    url = " ".join(pos) or input("URL (e.g. https://example.com): ").strip()
     if not url: return
     if "://" not in url: url = "http://" + url
     try:
-        import urllib.request
-        req = urllib.request.Request(url, method="HEAD")
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            print("Status:", resp.status)
-            for k, v in resp.getheaders():
-                print(f"{k}: {v}")
+        _split_url(url)
+    except ValueError as e:
+        print("http failed:", e)
+        return
+    try: timeout = float(opts.get("timeout") or HTTP_TIMEOUT)
+    except ValueError: timeout = HTTP_TIMEOUT
+    verify = not (opts.get("insecure") or opts.get("k"))
+    if opts.get("bench"):
+        total = max(1, opt_int(opts, "n", 1000))
+        conc = max(1, opt_int(opts, "c", 32))
+        method = (opts.get("X") or opts.get("method") or "GET").upper()
+        print(f"Benchmarking {method} {url}: {total} requests, concurrency {conc}. Ctrl+C stops.")
+        try:
+            lat, statuses, errors, nbytes, secs, opened = http_bench(url, total, conc, method, timeout, verify)
+        except KeyboardInterrupt:
+            print("\nBenchmark interrupted.")
+            return
+        done = len(lat)
+        print(f"{done} completed, {sum(errors.values())} failed in {secs:.2f}s — {done / secs:.1f} req/s, "
+              f"{format_size(nbytes)} received, {opened} connection(s) opened")
+        if statuses:
+            print("Status: " + ", ".join(f"{k} x{v}" for k, v in sorted(statuses.items())))
+        if errors:
+            print("Errors: " + ", ".join(f"{k} x{v}" for k, v in errors.most_common()))
+        for line in latency_histogram(lat):
+            print(line)
+        return
+    method = (opts.get("X") or opts.get("method") or "HEAD").upper()
+    repeat = max(1, opt_int(opts, "repeat", 1))
+    pool = HttpPool(timeout, verify)
+    try:
+        for i in range(repeat):
+            target = url
+            for _ in range(5):   # follow redirects like urlopen did
+                resp, data, t = http_request(pool, method, target)
+                if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+                    from urllib.parse import urljoin
+                    target = urljoin(target, resp.getheader("Location"))
+                    if i == 0:
+                        print(f"{resp.status} -> {target}  ({_timing_line(t)})")
+                    continue
+                break
+            if i == 0:
+                print("Status:", resp.status, resp.reason)
+                for k, v in resp.getheaders():
+                    print(f"{k}: {v}")
+                if method != "HEAD":
+                    print(f"Body: {format_size(len(data))}")
+                print()
+            print(f"[{i + 1}] {_timing_line(t)}")
+    except KeyboardInterrupt:
+        print("\nInterrupted.")
     except Exception as e:
         print("http failed:", e)
+    finally:
+        pool.close()
+
+# ---- segmented, resumable downloads ----
+DL_SEGMENTS = 8
+DL_MIN_SEGMENT = 1024 * 1024      # never split into ranges smaller than this
+DL_SAVE_EVERY = 1.0               # seconds between state-file writes
+DL_RETRIES = 3
+
+def _dl_probe(pool, url):
+    """HEAD with redirects followed. Returns (final url, size or None, ranges supported, validator)."""
+    from urllib.parse import urljoin
+    for _ in range(5):
+        resp, _, _ = http_request(pool, "HEAD", url)
+        if resp.status in (301, 302, 303, 307, 308) and resp.getheader("Location"):
+            url = urljoin(url, resp.getheader("Location"))
+            continue
+        break
+    if resp.status >= 400:
+        return url, None, False, ""
+    try:
+        size = int(resp.getheader("Content-Length") or "")
+    except ValueError:
+        size = None
+    ranges = (resp.getheader("Accept-Ranges") or "").lower() == "bytes" and bool(size)
+    etag = resp.getheader("ETag") or ""
+    if etag.startswith("W/"):
+        etag = ""   # If-Range needs a strong validator; servers answer a weak one with the whole file
+    return url, size, ranges, etag or resp.getheader("Last-Modified") or ""
+
+def _dl_load_state(state_path, url, size, validator):
+    """Saved segments for the same url/size/validator, else None."""
+    import json
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            st = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if st.get("url") != url or st.get("size") != size or st.get("validator") != validator:
+        return None
+    return st.get("segments")
+
+def _dl_save_state(state_path, url, size, validator, segments):
+    import json
+    tmp = state_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"url": url, "size": size, "validator": validator, "segments": segments}, f)
+    os.replace(tmp, state_path)
+
+def download_segmented(pool, url, part, size, validator, segments=DL_SEGMENTS, progress=True):
+    """Fetch url into the preallocated file part with parallel Range requests.
+    Progress is kept in part + '.json' ([start, end, done] per segment) so an interrupted run resumes."""
+    import threading, http.client
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+    state_path = part + ".json"
+    segs = _dl_load_state(state_path, url, size, validator) if os.path.exists(part) else None
+    if segs is None:
+        n = max(1, min(segments, size // DL_MIN_SEGMENT))
+        step = -(-size // n)
+        segs = [[s, min(s + step, size) - 1, 0] for s in range(0, size, step)]
+        with open(part, "wb") as f:
+            f.truncate(size)
+    else:
+        print(f"Resuming: {format_size(sum(s[2] for s in segs))} of {format_size(size)} already downloaded.")
+    lock = threading.Lock()
+    stop = threading.Event()
+    meter = Progress(size - sum(s[2] for s in segs), enabled=progress)   # counts this run's bytes only
+    headers = {"If-Range": validator} if validator else {}
+
+    def fetch(seg):
+        with open(part, "r+b", buffering=0) as f:
+            for attempt in range(DL_RETRIES):
+                start, end, done = seg
+                if start + done > end:
+                    return
+                f.seek(start + done)
+
+                def sink(chunk):
+                    if stop.is_set():
+                        raise InterruptedError("download stopped")
+                    chunk = chunk[:end + 1 - (seg[0] + seg[2])]
+                    f.write(chunk)
+                    with lock:
+                        seg[2] += len(chunk)
+                    meter.add(len(chunk))
+                try:
+                    resp, _, _ = http_request(pool, "GET", url, dict(headers, Range=f"bytes={start + done}-{end}"),
+                                              sink=sink, expect={206})
+                except InterruptedError:
+                    return
+                except (OSError, http.client.HTTPException):
+                    # dropped connections and IncompleteRead resume the segment from where it stopped
+                    if attempt == DL_RETRIES - 1:
+                        raise
+                    time.sleep(1 + attempt)
+                    continue
+                if resp.status != 206:
+                    raise OSError(f"server ignored the range request (HTTP {resp.status}); the file may have changed")
+
+    pending = [s for s in segs if s[0] + s[2] <= s[1]]
+    pool_ex = ThreadPoolExecutor(max_workers=max(1, len(pending)))
+    futures = [pool_ex.submit(fetch, s) for s in pending]
+    try:
+        while True:
+            finished, running = wait(futures, timeout=DL_SAVE_EVERY, return_when=FIRST_EXCEPTION)
+            with lock:
+                _dl_save_state(state_path, url, size, validator, segs)
+            for fut in finished:
+                if fut.exception():
+                    raise fut.exception()
+            if not running:
+                break
+    except BaseException:
+        stop.set()
+        pool_ex.shutdown(wait=True)
+        with lock:
+            _dl_save_state(state_path, url, size, validator, segs)
+        meter.clear()
+        raise
+    pool_ex.shutdown()
+    meter.clear()
+    os.remove(state_path)
+    return meter.done, meter.elapsed()
+
+def download_stream(pool, url, part, progress=True):
+    """Single-connection streaming fallback for servers without range support."""
+    with open(part, "wb") as f:
+        meter = Progress(0, enabled=progress)
+
+        def sink(chunk):
+            f.write(chunk)
+            meter.add(len(chunk))
+        try:
+            resp, _, _ = http_request(pool, "GET", url, sink=sink, expect={200})
+        finally:
+            meter.clear()
+    if resp.status != 200:
+        os.remove(part)
+        raise OSError(f"HTTP {resp.status} {resp.reason}")
+    return meter.done, meter.elapsed()
+
+def _parse_checksum(text):
+    """'sha256:<hex>' or bare hex (algorithm from length) -> (algo, hex)."""
+    algo, sep, digest = text.partition(":")
+    if not sep:
+        algo, digest = HASH_BY_LENGTH.get(len(text), ""), text
+    algo = algo.lower()
+    if algo not in HASH_ALGOS:
+        raise ValueError(f"cannot tell the hash algorithm of '{text}'; use algo:hex")
+    return algo, digest.strip().lower()
 
 def cmd_download(args=""):
-    url = args.strip() or input("URL to download: ").strip()
+    """download <url> [--out file] [--segments N] [--checksum sha256:<hex>] [--insecure]
+    Parallel ranged download into <file>.part with a resume state file; re-run the same command to resume."""
+    pos, opts = parse_opts(args, flags=("--insecure", "-k", "--single"),
+                           options=("--out", "-o", "--segments", "-s", "--checksum", "--sha256"))
+    url = " ".join(pos) or input("URL to download: ").strip()
     if not url: return
     if "://" not in url: url = "http://" + url
-    fname = os.path.basename(url.split("?", 1)[0]) or "download"
-    out = os.path.join(tempfile.gettempdir(), f"venom_download_{int(time.time())}_{fname}")
+    check = None
+    try:
+        if opts.get("sha256"):
+            check = ("sha256", opts["sha256"].lower())
+        elif opts.get("checksum"):
+            check = _parse_checksum(opts["checksum"])
+    except ValueError as e:
+        print("download failed:", e); return
+    fname = os.path.basename(url.split("?", 1)[0].rstrip("/")) or "download"
+    out = resolve_path(opts.get("out") or opts.get("o") or os.path.join(tempfile.gettempdir(), f"venom_download_{fname}"))
+    if os.path.isdir(out):
+        out = os.path.join(out, fname)
+    part = out + ".part"
+    segments = max(1, opt_int(opts, "segments", opt_int(opts, "s", DL_SEGMENTS)))
+    pool = HttpPool(verify=not (opts.get("insecure") or opts.get("k")))
     try:
-        import urllib.request
-        urllib.request.urlretrieve(url, out)
-        print("Saved to", out)
+        final, size, ranges, validator = _dl_probe(pool, url)
+        if ranges and not opts.get("single"):
+            print(f"Downloading {format_size(size)} in up to {segments} segment(s) -> {out}")
+            nbytes, secs = download_segmented(pool, final, part, size, validator, segments)
+        else:
+            why = "ranges not used" if ranges else "server does not support ranges" if size else "size unknown"
+            print(f"Streaming over one connection ({why}) -> {out}")
+            nbytes, secs = download_stream(pool, final, part)
+    except KeyboardInterrupt:
+        print("\nDownload interrupted." + (" Run the same command again to resume." if os.path.exists(part + ".json") else ""))
+        return
     except Exception as e:
         print("download failed:", e)
+        if os.path.exists(part + ".json"):
+            print("Partial data kept; run the same command again to resume.")
+        return
+    finally:
+        pool.close()
+    print(f"Received {format_size(nbytes)} in {secs:.2f}s ({nbytes / 1048576 / secs:.1f} MB/s)")
+    if check:
+        algo, expected = check
+        got = hash_file(part, algo)
+        if got != expected:
+            print(f"Checksum MISMATCH ({algo}): expected {expected}, got {got}. Kept as {part}")
+            return
+        print(f"Checksum OK ({algo})")
+    os.replace(part, out)
+    print("Saved to", out)
+
+# ---- native HTTP throughput test ----
+SPEED_STREAMS = 4
+SPEED_DURATION = 10.0
+SPEED_UPLOAD_BLOCK = 8 * 1024 * 1024    # bytes per upload POST
+SPEED_PROBE_EVERY = 0.25                # seconds between latency probes
+
+def _median(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else None
+
+def _latency_probe(url, stop, samples, verify):
+    """HEAD url on its own connection until stop is set, recording round-trip seconds."""
+    pool = HttpPool(5, verify)
+    try:
+        while not stop.is_set():
+            try:
+                _, _, t = http_request(pool, "HEAD", url)
+                samples.append(t["ttfb"])
+            except Exception:
+                pass
+            stop.wait(SPEED_PROBE_EVERY)
+    finally:
+        pool.close()
+
+def speed_phase(url, upload=False, streams=SPEED_STREAMS, duration=SPEED_DURATION, verify=True, probe_url=None):
+    """Run streams parallel GETs (or POSTs) against url for duration seconds; payloads are counted and discarded.
+    Returns (per-second byte samples, total bytes, seconds, loaded latencies, error names)."""
+    import threading
+    lock = threading.Lock()
+    stop = threading.Event()
+    moved = [0]
+    errors = []
+    loaded = []
+    block = os.urandom(SPEED_UPLOAD_BLOCK) if upload else b""
+    pool = HttpPool(verify=verify)
+
+    def count(n):
+        if stop.is_set():
+            raise InterruptedError("phase over")
+        with lock:
+            moved[0] += n
+
+    def worker():
+        sent = [0]
+
+        def body():
+            # called again when http_request retries on a fresh connection: un-count the failed attempt
+            count(-sent[0])
+            sent[0] = 0
+            view = memoryview(block)
+            for i in range(0, len(block), 64 * 1024):
+                chunk = view[i:i + 64 * 1024]
+                count(len(chunk))
+                sent[0] += len(chunk)
+                yield chunk
+
+        while not stop.is_set():
+            try:
+                if upload:
+                    sent[0] = 0
+                    http_request(pool, "POST", url, {"Content-Length": str(len(block)),
+                                                     "Content-Type": "application/octet-stream"}, body=body)
+                else:
+                    http_request(pool, "GET", url, {"Cache-Control": "no-cache"}, sink=lambda chunk: count(len(chunk)))
+            except InterruptedError:
+                return
+            except Exception as e:
+                errors.append(type(e).__name__)
+                stop.wait(0.5)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, streams))]
+    threads.append(threading.Thread(target=_latency_probe, args=(probe_url or url, stop, loaded, verify), daemon=True))
+    samples = []
+    t0 = time.perf_counter()
+    for th in threads:
+        th.start()
+    try:
+        last = 0
+        for sec in range(1, int(duration) + 1):
+            time.sleep(max(0.0, t0 + sec - time.perf_counter()))
+            with lock:
+                now = moved[0]
+            samples.append(now - last)
+            last = now
+            print(f"  {sec:>3}s  {samples[-1] * 8 / 1e6:9.1f} Mbps", flush=True)
+    finally:
+        stop.set()
+        elapsed = time.perf_counter() - t0
+        for th in threads:
+            th.join(2)
+        pool.close()
+    return samples, moved[0], elapsed, loaded, errors
+
+def cmd_speedtest(args=""):
+    """speedtest --url <endpoint> [--upload-url <endpoint>] [--streams N] [--duration S] [--no-upload] [--insecure]
+    Without --url, runs speedtest-cli/speedtest if installed."""
+    pos, opts = parse_opts(args, flags=("--no-upload", "--insecure", "-k"),
+                           options=("--url", "-u", "--upload-url", "--streams", "-n", "--duration", "-t"))
+    url = opts.get("url") or opts.get("u") or " ".join(pos)
+    if not url:
+        if shutil.which("speedtest-cli"):
+            run_and_print("speedtest-cli")
+        elif shutil.which("speedtest"):
+            run_and_print("speedtest")
+        else:
+            print("No speedtest CLI installed. Use 'speedtest --url <http endpoint>' to test against your own server.")
+        return
+    if "://" not in url: url = "http://" + url
+    up_url = opts.get("upload_url") or url
+    if "://" not in up_url: up_url = "http://" + up_url
+    streams = max(1, opt_int(opts, "streams", opt_int(opts, "n", SPEED_STREAMS)))
+    try: duration = max(1.0, float(opts.get("duration") or opts.get("t") or SPEED_DURATION))
+    except ValueError: duration = SPEED_DURATION
+    verify = not (opts.get("insecure") or opts.get("k"))
+    pool = HttpPool(5, verify)
+    idle = []
+    try:
+        for _ in range(5):
+            _, _, t = http_request(pool, "HEAD", url)
+            idle.append(t["ttfb"])
+    except Exception as e:
+        print("speedtest failed:", e)
+        return
+    finally:
+        pool.close()
+    print(f"Idle latency: {_median(idle) * 1000:.1f} ms   ({streams} stream(s), {duration:.0f}s per direction)")
+    phases = [("Download", url, False)] + ([] if opts.get("no_upload") else [("Upload", up_url, True)])
+    results = []
+    try:
+        for name, target, upload in phases:
+            print(f"{name} {target}")
+            samples, nbytes, secs, loaded, errors = speed_phase(target, upload, streams, duration, verify, probe_url=url)
+            results.append((name, samples, nbytes, secs, loaded, errors))
+    except KeyboardInterrupt:
+        print("\nSpeedtest interrupted.")
+    for name, samples, nbytes, secs, loaded, errors in results:
+        mbps = [s * 8 / 1e6 for s in samples]
+        line = f"{name}: {nbytes * 8 / 1e6 / secs:.1f} Mbps average"
+        if mbps:
+            line += f", {max(mbps):.1f} peak"
+        line += f", {format_size(nbytes)} in {secs:.1f}s"
+        if loaded:
+            line += f"; latency under load {_median(loaded) * 1000:.1f} ms (idle {_median(idle) * 1000:.1f})"
+        print(line)
+        if errors:
+            from collections import Counter
+            print("  errors: " + ", ".join(f"{k} x{v}" for k, v in Counter(errors).most_common()))
 
 def cmd_open(args=""):
     target = args.strip() or input("URL/file to open: ").strip()
@@ -775,29 +2502,288 @@ def cmd_open(args=""):
     except Exception as e:
         print("open failed:", e)
 
-def cmd_sendemail(args=""):
-    """Send an email via SMTP. Prompts for all required information."""
+# ---- batch SMTP sending (sendemail --batch) ----
+SMTP_CONNECTIONS = 2
+SMTP_RATE = 5.0          # messages per second across all connections (0 = unlimited)
+SMTP_RETRIES = 3
+SMTP_BACKOFF = 2.0       # seconds before the first retry; doubles each attempt
+SMTP_FLAGS = ("--debug", "--dry-run", "--ssl", "--no-tls")
+SMTP_OPTIONS = ("--batch", "--template", "--subject", "--server", "--port", "--user", "--from",
+                "--connections", "-c", "--rate", "--retries")
+
+class SmtpTransient(Exception):
+    """A 4xx reply or dropped connection: worth retrying."""
+
+def _smtp_transient(e):
+    """True for errors a retry can fix: SmtpTransient, 4xx replies (greetings included), lost or refused connections.
+    (smtplib's exceptions are OSErrors too, so plain socket errors have to be told apart from 5xx replies.)"""
+    import smtplib
+    if isinstance(e, (SmtpTransient, smtplib.SMTPServerDisconnected)):
+        return True
+    if isinstance(e, smtplib.SMTPResponseException):
+        return 400 <= e.smtp_code < 500
+    return isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+
+def smtp_connect(host, port, user=None, password=None, ssl_mode=None, debug=False, timeout=30):
+    """Open an SMTP session: implicit TLS on 465 (or ssl_mode 'ssl'), STARTTLS when offered (unless 'none'), then login."""
+    import smtplib
+    if ssl_mode == "ssl" or (ssl_mode is None and port == 465):
+        server = smtplib.SMTP_SSL(host, port, timeout=timeout)
+    else:
+        server = smtplib.SMTP(host, port, timeout=timeout)
+    if debug:
+        server.set_debuglevel(1)
+    server.ehlo()
+    if ssl_mode != "none" and not isinstance(server, smtplib.SMTP_SSL) and server.has_extn("starttls"):
+        server.starttls()
+        server.ehlo()
+    if user:
+        server.login(user, password or "")
+    return server
+
+def _smtp_send(server, sender, rcpt, text):
+    """sendmail that turns 4xx replies into SmtpTransient; 5xx replies propagate."""
     import smtplib
+    try:
+        refused = server.sendmail(sender, [rcpt], text)
+    except smtplib.SMTPRecipientsRefused as e:
+        code, msg = e.recipients.get(rcpt, (550, b""))
+        if 400 <= code < 500:
+            raise SmtpTransient(f"{code} {msg.decode(errors='replace')}")
+        raise
+    except smtplib.SMTPResponseException as e:
+        if 400 <= e.smtp_code < 500:
+            raise SmtpTransient(f"{e.smtp_code} {e.smtp_error.decode(errors='replace') if isinstance(e.smtp_error, bytes) else e.smtp_error}")
+        raise
+    except (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout) as e:
+        raise SmtpTransient(f"connection lost ({e})")
+    if refused:
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+def _load_recipients(path):
+    """Rows of a CSV with an 'email' column (or the first column if there is none) -> list of dicts."""
+    import csv
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        has_header = "@" not in sample.splitlines()[0] if sample.strip() else False
+        if has_header:
+            rows = list(csv.DictReader(f))   # extra fields land under the key None; dropped below
+        else:
+            rows = [{"email": r[0], **{f"col{i}": v for i, v in enumerate(r[1:], 1)}} for r in csv.reader(f) if r]
+    out = []
+    for r in rows:
+        r = {k.strip().lower(): (v or "").strip() for k, v in r.items() if k is not None}
+        if "email" not in r and r:
+            r["email"] = next(iter(r.values()))
+        if r.get("email"):
+            out.append(r)
+    return out
+
+def _render_mail(template, subject, row, sender):
+    """Fill $field placeholders from the recipient row and build the message text.
+    A first template line 'Subject: ...' overrides --subject."""
+    from string import Template
     from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-    
-    print("=" * 70)
-    print("EMAIL CONFIGURATION")
-    print("=" * 70)
-    
-    # Popular SMTP servers reference with auto-select
-    print("\nPopular Email Providers SMTP Settings:")
-    print("-" * 70)
-    smtp_providers = {
-        "1": ("Gmail", "smtp.gmail.com", 587),
-        "2": ("Outlook/Hotmail", "smtp-mail.outlook.com", 587),
-        "3": ("Yahoo", "smtp.mail.yahoo.com", 587),
-        "4": ("Yahoo (SSL)", "smtp.mail.yahoo.com", 465),
-        "5": ("AOL", "smtp.aol.com", 587),
-        "6": ("iCloud", "smtp.mail.me.com", 587),
-        "7": ("Zoho", "smtp.zoho.com", 587),
-        "8": ("ProtonMail", "127.0.0.1", 1025),
-        "9": ("Microsoft 365/Office 365", "smtp.office365.com", 587),
+    from email.utils import formatdate, make_msgid
+    if template.startswith("Subject:"):
+        first, _, template = template.partition("\n")
+        subject = first[len("Subject:"):].strip()
+    msg = MIMEText(Template(template).safe_substitute(row), "plain", "utf-8")
+    msg["From"] = sender
+    msg["To"] = row["email"]
+    msg["Subject"] = Template(subject).safe_substitute(row)
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid()
+    return msg.as_string()
+
+def send_batch(rows, template, subject, sender, connect, connections=SMTP_CONNECTIONS,
+               rate=SMTP_RATE, retries=SMTP_RETRIES):
+    """Deliver one message per row over `connections` persistent sessions made by connect().
+    Sends are spaced to at most `rate` per second overall; transient failures back off and retry
+    (reconnecting if the session dropped). Any other error fails just that row.
+    An authentication failure stops the whole batch.
+    Returns (sent, {email: error}, retries used, seconds, fatal error or None)."""
+    import queue, threading, smtplib
+    todo = queue.Queue()
+    for r in rows:
+        todo.put(r)
+    lock = threading.Lock()
+    state = {"next": time.monotonic(), "sent": 0, "retried": 0}
+    failed = {}
+    stop = threading.Event()
+    meter = Progress(len(rows), unit="messages")
+
+    def wait_turn():
+        if rate <= 0:
+            return
+        with lock:
+            slot = max(state["next"], time.monotonic())
+            state["next"] = slot + 1.0 / rate
+        stop.wait(max(0.0, slot - time.monotonic()))
+
+    def drop(server):
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    def worker():
+        server = None
+        try:
+            while not stop.is_set():
+                try:
+                    row = todo.get_nowait()
+                except queue.Empty:
+                    return
+                for attempt in range(retries + 1):
+                    try:
+                        text = _render_mail(template, subject, row, sender)
+                        if server is None:
+                            server = connect()
+                        wait_turn()
+                        _smtp_send(server, sender, row["email"], text)
+                        with lock:
+                            state["sent"] += 1
+                        break
+                    except smtplib.SMTPAuthenticationError as e:
+                        state["fatal"] = f"authentication failed: {e}"
+                        stop.set()
+                        return
+                    except (SmtpTransient, OSError) as e:
+                        if not _smtp_transient(e):
+                            failed[row["email"]] = str(e)
+                            break
+                        # 4xx reply or a session problem: back off, reconnect if needed, try again
+                        if attempt == retries:
+                            failed[row["email"]] = f"gave up after {retries} retries: {e}"
+                            break
+                        with lock:
+                            state["retried"] += 1
+                        if server is not None and (not isinstance(e, SmtpTransient) or "connection lost" in str(e)
+                                                   or str(e).startswith("421")):
+                            drop(server)
+                            server = None
+                        stop.wait(SMTP_BACKOFF * 2 ** attempt)
+                    except Exception as e:
+                        # a bad row (unencodable address, template error, ...) must not kill the worker
+                        failed[row["email"]] = f"{type(e).__name__}: {e}"
+                        if server is not None:
+                            drop(server)   # the session may be mid-transaction; start the next row clean
+                            server = None
+                        break
+                meter.add(1)
+        finally:
+            if server is not None:
+                try:
+                    server.quit()
+                except Exception:
+                    pass
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(connections, len(rows))))]
+    for th in threads:
+        th.start()
+    try:
+        for th in threads:
+            while th.is_alive():
+                th.join(0.2)
+    except KeyboardInterrupt:
+        stop.set()
+        raise
+    finally:
+        meter.clear()
+    return state["sent"], failed, state["retried"], meter.elapsed(), state.get("fatal")
+
+def _sendemail_batch(opts):
+    """sendemail --batch recipients.csv --template body.txt --server host[:port] --from addr [...]"""
+    import getpass, csv
+    path = resolve_path(opts["batch"])
+    try:
+        rows = _load_recipients(path)
+        with open(resolve_path(opts.get("template") or ""), "r", encoding="utf-8") as f:
+            template = f.read()
+    except (OSError, csv.Error) as e:
+        print("sendemail failed:", e); return
+    if not rows:
+        print("No recipients in", path); return
+    host, _, port_text = (opts.get("server") or "").partition(":")
+    if not host:
+        print("--server host[:port] is required in batch mode."); return
+    port = opt_int(opts, "port", int(port_text) if port_text.isdigit() else 587)
+    user = opts.get("user")
+    sender = opts.get("from") or user
+    if not sender:
+        print("--from (or --user) is required in batch mode."); return
+    # never taken from the command line: main() saves every command to the history file
+    password = os.environ.get("VENOM_SMTP_PASSWORD")
+    if user and not password:
+        password = getpass.getpass(f"Password for {user}: ")
+    subject = opts.get("subject") or "(No Subject)"
+    if opts.get("dry_run"):
+        print(f"{len(rows)} recipient(s). First message:\n")
+        print(_render_mail(template, subject, rows[0], sender))
+        return
+    ssl_mode = "ssl" if opts.get("ssl") else "none" if opts.get("no_tls") else None
+    connect = lambda: smtp_connect(host, port, user, password, ssl_mode, bool(opts.get("debug")))
+    try: rate = float(opts.get("rate") or SMTP_RATE)
+    except ValueError: rate = SMTP_RATE
+    conns = max(1, opt_int(opts, "connections", opt_int(opts, "c", SMTP_CONNECTIONS)))
+    print(f"Sending {len(rows)} message(s) via {host}:{port} over {conns} connection(s), "
+          f"{'unlimited' if rate <= 0 else f'{rate:g}/s'}. Ctrl+C stops.")
+    try:
+        sent, failed, retried, secs, fatal = send_batch(rows, template, subject, sender, connect, conns, rate,
+                                                 max(0, opt_int(opts, "retries", SMTP_RETRIES)))
+    except KeyboardInterrupt:
+        print("\nBatch interrupted; messages already accepted by the server were sent.")
+        return
+    if fatal:
+        print("Batch stopped:", fatal)
+    print(f"Delivered {sent}/{len(rows)} in {secs:.1f}s ({sent / secs:.1f} msg/s), {len(failed)} failed, {retried} retr{'y' if retried == 1 else 'ies'}.")
+    if failed:
+        for email, err in list(failed.items())[:20]:
+            print(f"  {email}: {err}")
+        if len(failed) > 20:
+            print(f"  ... and {len(failed) - 20} more")
+        out = os.path.splitext(path)[0] + ".failed.csv"
+        with open(out, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["email", "error"])
+            w.writerows(failed.items())
+        print("Failed recipients written to", out)
+
+def cmd_sendemail(args=""):
+    """Send an email via SMTP. Prompts for all required information.
+    sendemail --batch recipients.csv --template body.txt --server host[:port] --from addr sends non-interactively;
+    --debug shows the SMTP conversation."""
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    pos, opts = parse_opts(args, flags=SMTP_FLAGS, options=SMTP_OPTIONS)
+    if any(p.split("=")[0] == "--password" for p in pos):
+        print("--password is not accepted (commands are saved to the history file). "
+              "Set VENOM_SMTP_PASSWORD or enter it at the prompt.")
+        return
+    if opts.get("batch"):
+        _sendemail_batch(opts)
+        return
+    
+    print("=" * 70)
+    print("EMAIL CONFIGURATION")
+    print("=" * 70)
+    
+    # Popular SMTP servers reference with auto-select
+    print("\nPopular Email Providers SMTP Settings:")
+    print("-" * 70)
+    smtp_providers = {
+        "1": ("Gmail", "smtp.gmail.com", 587),
+        "2": ("Outlook/Hotmail", "smtp-mail.outlook.com", 587),
+        "3": ("Yahoo", "smtp.mail.yahoo.com", 587),
+        "4": ("Yahoo (SSL)", "smtp.mail.yahoo.com", 465),
+        "5": ("AOL", "smtp.aol.com", 587),
+        "6": ("iCloud", "smtp.mail.me.com", 587),
+        "7": ("Zoho", "smtp.zoho.com", 587),
+        "8": ("ProtonMail", "127.0.0.1", 1025),
+        "9": ("Microsoft 365/Office 365", "smtp.office365.com", 587),
         "10": ("Google Workspace (G Suite)", "smtp.gmail.com", 587),
         "11": ("Custom Domain", None, None),
         "12": ("Custom Server", None, None),
@@ -947,7 +2933,8 @@ def cmd_sendemail(args=""):
         # Connect and send
         print(f"\nConnecting to {smtp_server}:{smtp_port}...")
         server = smtplib.SMTP(smtp_server, smtp_port)
-        server.set_debuglevel(1)  # Enable debug output
+        if opts.get("debug"):
+            server.set_debuglevel(1)
         print("Starting TLS...")
         server.starttls()
         print("Logging in...")
@@ -1020,74 +3007,952 @@ def resolve_path(p):
     p = os.path.expandvars(p)
     return os.path.abspath(p)
 
+def format_size(size):
+    """Bytes -> human-readable string ('1.50 MB')."""
+    units = ["B","KB","MB","GB","TB"]
+    i = 0
+    while size >= 1024 and i < len(units)-1:
+        size /= 1024.0
+        i += 1
+    return f"{size:.2f} {units[i]}"
+
+class Progress:
+    """Throttled single-line transfer meter (done/total MB, MB/s, ETA). Thread-safe add().
+    With unit set (e.g. "entries") it counts items instead of bytes."""
+
+    def __init__(self, total=0, enabled=True, interval=0.25, unit=None):
+        import threading
+        self.total, self.enabled, self.interval, self.unit = total, enabled, interval, unit
+        self.done = 0
+        self.t0 = self._last = time.perf_counter()
+        self._shown = False
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return max(time.perf_counter() - self.t0, 1e-6)
+
+    def rate(self):
+        """Bytes per second so far."""
+        return self.done / self.elapsed()
+
+    def add(self, n):
+        with self._lock:
+            self.done += n
+            now = time.perf_counter()
+            if self.enabled and now - self._last >= self.interval:
+                self._last = now
+                self._shown = True
+                print("\r" + self.line().ljust(60), end="", flush=True)
+
+    def line(self):
+        rate = self.rate()
+        if self.unit:
+            text = f"{self.done}" + (f"/{self.total}" if self.total else "") + f" {self.unit}  {rate:.0f}/s"
+        else:
+            text = f"{self.done / 1048576:.1f}"
+            if self.total:
+                text += f"/{self.total / 1048576:.1f}"
+            text += f" MB  {rate / 1048576:.1f} MB/s"
+        if self.total and rate > 0 and self.done < self.total:
+            text += f"  ETA {(self.total - self.done) / rate:.0f}s"
+        return text
+
+    def clear(self):
+        """Erase the meter line (call before printing other output and when finished)."""
+        with self._lock:
+            if self._shown:
+                print("\r" + " " * 60 + "\r", end="", flush=True)
+                self._shown = False
+
+def retry_locked(fn, *args, attempts=3, delay=0.5):
+    """Run fn(*args), retrying while Windows reports the file is in use (winerror 32)."""
+    for attempt in range(attempts):
+        try:
+            return fn(*args)
+        except OSError as e:
+            if hasattr(e, "winerror") and e.winerror == 32 and attempt < attempts - 1:
+                print(f"File in use... retrying ({attempt+1}/{attempts})")
+                time.sleep(delay)
+                continue
+            raise
+
+# ---- shared directory walker (find, search, recent, compress, copy) ----
+WALK_JOBS = 8
+WALK_FLAGS = ("--one-filesystem", "-x", "--follow-links", "--gitignore")
+WALK_OPTIONS = ("--max-depth", "--exclude", "--exclude-from")
+
+def _glob_regex(pattern):
+    """gitignore-style glob -> regex over '/'-separated relative paths ('**' spans directories)."""
+    import re
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?"); i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*"); i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*"); i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]"); i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            j = pattern.index("]", i + 1)
+            body = pattern[i + 1:j]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]"); i = j + 1
+        else:
+            out.append(re.escape(pattern[i])); i += 1
+    return re.compile("".join(out) + r"\Z", re.IGNORECASE if IS_WINDOWS else 0)
+
+class IgnoreRules:
+    """Ordered .gitignore-style rules; the last matching rule wins ('!' re-includes).
+    Each rule is relative to the directory of the file (or walk root) it came from."""
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def add(self, line, base):
+        line = line.rstrip("\r\n")
+        if not line.strip() or line.startswith("#"):
+            return
+        line = line.rstrip()
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        # a slash anywhere but the end anchors the pattern to base
+        anchored = "/" in line.rstrip("/")
+        self.rules.append((base, _glob_regex(line.strip("/")), negate, dir_only, anchored))
+
+    def extended(self, path, base=None):
+        """Copy of these rules plus the lines of ignore file path (relative to base, default its dir)."""
+        rules = IgnoreRules(self.rules)
+        base = base or os.path.dirname(path)
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    rules.add(line, base)
+        except OSError:
+            pass
+        return rules
+
+    def match(self, path, is_dir):
+        ignored = False
+        for base, rx, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            prefix = base if base.endswith(os.sep) else base + os.sep
+            if not path.startswith(prefix):
+                continue
+            rel = path[len(prefix):].replace(os.sep, "/")
+            if rx.match(rel if anchored else rel.rsplit("/", 1)[-1]):
+                ignored = not negate
+        return ignored
+
+def _is_link_entry(e):
+    """True for symlinks and, on Windows, junctions and other reparse points (never descended into)."""
+    import stat
+    if e.is_symlink():
+        return True
+    return IS_WINDOWS and bool(getattr(e.stat(follow_symlinks=False), "st_file_attributes", 0)
+                               & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+def _is_link_path(path):
+    """_is_link_entry for a path."""
+    import stat
+    if os.path.islink(path):
+        return True
+    try:
+        return IS_WINDOWS and bool(getattr(os.lstat(path), "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+    except OSError:
+        return False
+
+def walk_tree(root, dirs=False, max_depth=None, one_filesystem=False, follow_links=False,
+              ignore=None, gitignore=False, jobs=WALK_JOBS):
+    """Yield os.DirEntry objects for files below root (and directories too if dirs=True).
+
+    Directories are listed with scandir on a thread pool; stat results are fetched in the
+    worker so entry.stat() is cached by the time the caller sees it. Order is not defined.
+    max_depth=1 lists root only. one_filesystem stays on root's device. follow_links descends
+    into linked directories, skipping any directory already visited (loop protection).
+    ignore is an IgnoreRules; gitignore also applies each directory's .gitignore below it."""
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    root_dev = os.stat(root).st_dev if one_filesystem else None
+
+    def scan(d, depth, rules):
+        if gitignore and os.path.isfile(os.path.join(d, ".gitignore")):
+            rules = rules.extended(os.path.join(d, ".gitignore"))
+        files, subdirs = [], []
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=follow_links) and (follow_links or not _is_link_entry(e)):
+                            if rules and rules.match(e.path, True):
+                                continue
+                            key = None
+                            if one_filesystem or follow_links:
+                                st = os.stat(e.path)
+                                if one_filesystem and st.st_dev != root_dev:
+                                    continue
+                                key = (st.st_dev, st.st_ino) if follow_links else None
+                            subdirs.append((e, key))
+                        elif e.is_file():
+                            if rules and rules.match(e.path, False):
+                                continue
+                            e.stat()
+                            files.append(e)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return depth, rules, files, subdirs
+
+    seen = set()
+    if follow_links:
+        st = os.stat(root)
+        seen.add((st.st_dev, st.st_ino))
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        pending = {pool.submit(scan, root, 0, ignore or IgnoreRules())}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                depth, rules, files, subdirs = fut.result()
+                yield from files
+                for e, key in subdirs:
+                    if key is not None:
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    if dirs:
+                        yield e
+                    if max_depth is None or depth + 1 < max_depth:
+                        pending.add(pool.submit(scan, e.path, depth + 1, rules))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def walk_options(opts, root):
+    """walk_tree() keyword arguments from the shared walker options (WALK_FLAGS / WALK_OPTIONS)."""
+    rules = IgnoreRules()
+    for pat in opts.get("exclude", "").split(","):
+        rules.add(pat.strip(), root)
+    if opts.get("exclude_from"):
+        rules = rules.extended(resolve_path(opts["exclude_from"]), base=root)
+    depth = opt_int(opts, "max_depth", 0)
+    return {"max_depth": depth if depth > 0 else None,
+            "one_filesystem": bool(opts.get("one_filesystem") or opts.get("x")),
+            "follow_links": bool(opts.get("follow_links")),
+            "gitignore": bool(opts.get("gitignore")),
+            "ignore": rules}
+
+def parse_age(text):
+    """'90', '30s', '15m', '2h', '7d', '2w' -> seconds (float). Raises ValueError."""
+    text = text.strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+def parse_timestamp(text):
+    """Epoch seconds or ISO date/datetime ('2024-05-01', '2024-05-01T12:30') -> epoch seconds. Raises ValueError."""
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.datetime.fromisoformat(text.strip()).timestamp()
+
+def parse_size(text):
+    """'4096', '64K', '10M', '2G' -> bytes (int). Raises ValueError."""
+    text = text.strip().upper().rstrip("B")
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+HASH_BUF = 1024 * 1024
+HASH_MMAP_MIN = 64 * 1024 * 1024   # files at least this big are hashed through mmap
+
+def hash_file(path, algo="blake2b", progress=None):
+    """Hex digest of a whole file (hashlib releases the GIL, so threads scale).
+    Large files are memory-mapped; others are read in HASH_BUF pieces into a reused buffer."""
+    import hashlib, mmap
+    h = hashlib.new(algo)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= HASH_MMAP_MIN:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for pos in range(0, size, HASH_MMAP_MIN):
+                    end = min(pos + HASH_MMAP_MIN, size)
+                    with memoryview(mm)[pos:end] as view:
+                        h.update(view)
+                    if progress:
+                        progress.add(end - pos)
+            return h.hexdigest()
+        buf = bytearray(HASH_BUF)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+            if progress:
+                progress.add(n)
+    return h.hexdigest()
+
+# ---- filename index (SQLite under the temp dir, next to HIST_PATH) ----
+def _index_open():
+    import sqlite3
+    db = sqlite3.connect(INDEX_PATH)
+    db.executescript("""
+        CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY, built REAL, scanned INTEGER);
+        CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL);
+        CREATE TABLE IF NOT EXISTS entries (dir TEXT, name TEXT, is_dir INTEGER);
+        CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir);
+        CREATE TABLE IF NOT EXISTS du (path TEXT PRIMARY KEY, mtime REAL, bytes INTEGER, files INTEGER,
+                                       subdirs TEXT, top TEXT);
+    """)
+    return db
+
+def _index_prefix(path):
+    return path if path.endswith(os.sep) else path + os.sep
+
+def _index_under(column, path):
+    """SQL filter + params selecting rows at or below path."""
+    prefix = _index_prefix(path)
+    return f"({column} = ? OR substr({column}, 1, ?) = ?)", [path, len(prefix), prefix]
+
+def _index_drop_tree(db, path):
+    where, params = _index_under("dir", path)
+    db.execute(f"DELETE FROM entries WHERE {where}", params)
+    where, params = _index_under("path", path)
+    db.execute(f"DELETE FROM dirs WHERE {where}", params)
+
+def _index_root_for(db, path):
+    """Return the indexed root covering path, or None."""
+    for (root,) in db.execute("SELECT path FROM roots ORDER BY length(path) DESC"):
+        if path == root or path.startswith(_index_prefix(root)):
+            return root
+    return None
+
+def _index_refresh(db, root, full=False):
+    """Walk root, re-listing only directories whose mtime changed. Returns (dirs_seen, dirs_rescanned)."""
+    where, params = _index_under("path", root)
+    known = {} if full else dict(db.execute(f"SELECT path, mtime FROM dirs WHERE {where}", params))
+    if full:
+        _index_drop_tree(db, root)
+    stack, seen, rescanned = [root], 0, 0
+    while stack:
+        d = stack.pop()
+        try:
+            mtime = os.stat(d).st_mtime
+        except OSError:
+            _index_drop_tree(db, d)
+            continue
+        seen += 1
+        if known.get(d) == mtime:
+            stack.extend(os.path.join(d, n) for (n,) in
+                         db.execute("SELECT name FROM entries WHERE dir = ? AND is_dir = 1", (d,)))
+            continue
+        rescanned += 1
+        old_subdirs = {n for (n,) in db.execute("SELECT name FROM entries WHERE dir = ? AND is_dir = 1", (d,))}
+        rows, subdirs = [], set()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        is_dir = e.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    rows.append((d, e.name, int(is_dir)))
+                    if is_dir:
+                        subdirs.add(e.name)
+        except OSError:
+            pass
+        for gone in old_subdirs - subdirs:
+            _index_drop_tree(db, os.path.join(d, gone))
+        db.execute("DELETE FROM entries WHERE dir = ?", (d,))
+        db.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+        db.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (d, mtime))
+        stack.extend(os.path.join(d, n) for n in subdirs)
+    db.execute("INSERT OR REPLACE INTO roots VALUES (?, ?, ?)", (root, time.time(), seen))
+    db.commit()
+    return seen, rescanned
+
+def _index_query(db, pattern, start):
+    """Glob (*, ?, [..]) or substring query against the index, limited to start."""
+    where, params = _index_under("dir", start)
+    if not any(c in pattern for c in "*?["):
+        pattern = f"*{pattern}*"
+    if "[" in pattern:
+        # character classes need fnmatch semantics (case-insensitive on Windows)
+        db.create_function("fnmatch", 2, lambda n, p: int(glob.fnmatch.fnmatch(n, p)), deterministic=True)
+        cond, arg = "fnmatch(name, ?)", pattern
+    elif IS_WINDOWS:
+        like = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        cond, arg = "name LIKE ? ESCAPE '\\'", like.replace("*", "%").replace("?", "_")
+    else:
+        cond, arg = "name GLOB ?", pattern
+    sql = f"SELECT dir, name FROM entries WHERE {cond} AND {where} ORDER BY dir, name"
+    return [os.path.join(d, n) for d, n in db.execute(sql, [arg] + params)]
+
+def cmd_index(args=""):
+    """index build|status|drop <path> — manage the on-disk filename index used by 'find --index'."""
+    pos, opts = parse_opts(args, flags=("--full",))
+    action = pos[0].lower() if pos else input("Action (build/status/drop): ").strip().lower()
+    path = resolve_path(" ".join(pos[1:]) or ".")
+    db = _index_open()
+    try:
+        if action == "build":
+            if not os.path.isdir(path):
+                print("Not a directory:", path); return
+            t0 = time.perf_counter()
+            seen, rescanned = _index_refresh(db, path, full=bool(opts.get("full")))
+            print(f"Indexed {path}: {seen} dirs, {rescanned} re-scanned in {time.perf_counter() - t0:.2f}s")
+        elif action == "status":
+            roots = db.execute("SELECT path, built, scanned FROM roots ORDER BY path").fetchall()
+            if not roots:
+                print("No indexed paths.")
+            for root, built, scanned in roots:
+                where, params = _index_under("dir", root)
+                count = db.execute(f"SELECT count(*) FROM entries WHERE {where}", params).fetchone()[0]
+                when = datetime.datetime.fromtimestamp(built).isoformat(timespec="seconds")
+                print(f"{root}: {count} entries in {scanned} dirs (refreshed {when})")
+            print("Index file:", INDEX_PATH)
+        elif action == "drop":
+            root = _index_root_for(db, path)
+            if root != path:
+                print("Not indexed:", path); return
+            _index_drop_tree(db, path)
+            db.execute("DELETE FROM roots WHERE path = ?", (path,))
+            db.commit()
+            print("Dropped index for", path)
+        else:
+            print("Usage: index build|status|drop <path> [--full]")
+    except KeyboardInterrupt:
+        print("\nIndexing interrupted (partial progress kept).")
+        db.commit()
+    finally:
+        db.close()
+
 def cmd_find(args=""):
-    """find <pattern> — find files by name pattern (supports glob, searches recursively)."""
-    pattern = args.strip() or input("Filename or pattern to find (e.g. '*.txt' or report.docx): ").strip()
+    """find <pattern> [path] [--index] [--refresh] [walk options] — find files by name pattern (supports glob, searches recursively)."""
+    if "--index" in args.split():
+        return _find_indexed(args)
+    pos, opts = parse_opts(args, flags=WALK_FLAGS, options=WALK_OPTIONS)
+    if not pos:
+        pos = parse_opts(input("Filename or pattern to find (e.g. '*.txt' or report.docx): "))[0]
+    pattern = " ".join(pos)
     if not pattern:
         return
     start = "."
     # allow specifying path: "pattern path"
-    parts = pattern.split(" ", 1)
-    if len(parts) == 2 and os.path.exists(parts[1]):
-        pattern, start = parts[0], parts[1]
+    if len(pos) >= 2 and os.path.exists(" ".join(pos[1:])):
+        pattern, start = pos[0], " ".join(pos[1:])
     start = resolve_path(start)
-    matches = []
-    for root, dirs, files in os.walk(start):
-        # check files and dirs
-        for name in files + dirs:
-            if glob.fnmatch.fnmatch(name, pattern):
-                matches.append(os.path.join(root, name))
+    # files and dirs
+    matches = sorted(e.path for e in walk_tree(start, dirs=True, **walk_options(opts, start))
+                     if glob.fnmatch.fnmatch(e.name, pattern))
     if matches:
         for m in matches:
             print(m)
     else:
         print("No matches found.")
 
+def _find_indexed(args):
+    pos, opts = parse_opts(args, flags=("--index", "--refresh"))
+    if not pos:
+        print("Usage: find --index <pattern> [path] [--refresh]"); return
+    pattern, start = pos[0], resolve_path(" ".join(pos[1:]) or ".")
+    db = _index_open()
+    try:
+        root = _index_root_for(db, start)
+        if root is None:
+            print(f"No index covers {start}. Run 'index build <path>' first.")
+            return
+        if opts.get("refresh"):
+            _index_refresh(db, root)
+        t0 = time.perf_counter()
+        matches = _index_query(db, pattern, start)
+        elapsed = (time.perf_counter() - t0) * 1000
+    finally:
+        db.close()
+    for m in matches:
+        print(m)
+    if not matches:
+        print("No matches found.")
+    print(f"{len(matches)} match(es) from index in {elapsed:.1f} ms")
+
+# ---- search engine ----
+SEARCH_SNIFF_SIZE = 8192          # bytes read to decide if a file is binary
+SEARCH_MMAP_MIN = 1024 * 1024     # files at least this big are memory-mapped
+SEARCH_BATCH = 64                 # files handed to a worker per task
+
+def _search_file(fpath, pattern, flags, all_matches):
+    """Scan one file as raw bytes. Returns [(lineno, line), ...] (first match only unless all_matches)."""
+    import re, mmap
+    rx = re.compile(pattern, flags)
+    hits = []
+    try:
+        with open(fpath, "rb") as f:
+            head = f.read(SEARCH_SNIFF_SIZE)
+            if not head or b"\0" in head:
+                return hits
+            size = os.fstat(f.fileno()).st_size
+            if size >= SEARCH_MMAP_MIN:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = head + f.read()
+            try:
+                lineno, last = 1, 0
+                for m in rx.finditer(data):
+                    start = m.start()
+                    if start < last:
+                        continue
+                    lineno += data[last:start].count(b"\n")
+                    bol = data.rfind(b"\n", 0, start) + 1
+                    eol = data.find(b"\n", start)
+                    if eol == -1:
+                        eol = len(data)
+                    hits.append((lineno, data[bol:eol].decode("utf-8", errors="replace").strip()))
+                    if not all_matches:
+                        break
+                    # continue after this line so each line is reported once
+                    lineno += 1
+                    last = eol + 1
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+    except (OSError, ValueError):
+        pass
+    return hits
+
+def _search_batch(paths, pattern, flags, all_matches):
+    """Worker entry point: scan a batch of files, return [(path, hits), ...] for files that matched."""
+    out = []
+    for p in paths:
+        hits = _search_file(p, pattern, flags, all_matches)
+        if hits:
+            out.append((p, hits))
+    return out
+
 def cmd_search(args=""):
-    """search <text> <path> — search for text inside files. Prompts if missing."""
-    parts = args.strip().split(" ", 1)
-    if len(parts) == 2:
-        text, path = parts[0], parts[1]
+    """search <text> [path] [--regex] [-i] [--all] [--jobs N] [walk options] — search for text inside files. Prompts if missing."""
+    import re
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    pos, opts = parse_opts(args, flags=("--regex", "-e", "-i", "--ignore-case", "--all", "-a") + WALK_FLAGS,
+                           options=("--jobs", "-j") + WALK_OPTIONS)
+    if pos:
+        text = pos[0]
+        path = " ".join(pos[1:]) or "."
     else:
-        text = args.strip() or input("Text to search for: ").strip()
+        text = input("Text to search for: ").strip()
         path = input("Path to search in (default .): ").strip() or "."
     if not text:
         return
+    use_regex = opts.get("regex") or opts.get("e")
+    pattern = text.encode("utf-8") if use_regex else re.escape(text.encode("utf-8"))
+    flags = re.MULTILINE
+    if opts.get("i") or opts.get("ignore_case"):
+        flags |= re.IGNORECASE
+    try:
+        re.compile(pattern, flags)
+    except re.error as e:
+        print("Invalid regex:", e)
+        return
+    all_matches = bool(opts.get("all") or opts.get("a"))
+    jobs = max(1, opt_int(opts, "jobs", opt_int(opts, "j", os.cpu_count() or 1)))
     start = resolve_path(path)
-    matches = []
-    for root, dirs, files in os.walk(start):
-        for fname in files:
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r", encoding="utf-8", errors="ignore") as f:
-                    for i, line in enumerate(f, 1):
-                        if text in line:
-                            print(f"{fpath}:{i}: {line.strip()}")
-                            matches.append(fpath)
-                            break
-            except Exception:
-                continue
-    if not matches:
+    if not os.path.exists(start):
+        print("Not found:", start); return
+
+    files_scanned = files_matched = match_count = 0
+    t0 = time.perf_counter()
+
+    def report(done):
+        nonlocal files_matched, match_count
+        for fut in done:
+            for fpath, hits in fut.result():
+                files_matched += 1
+                for lineno, line in hits:
+                    match_count += 1
+                    print(f"{fpath}:{lineno}: {line}")
+
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    pending = set()
+    try:
+        if os.path.isfile(start):
+            paths = [start]
+        else:
+            paths = (e.path for e in walk_tree(start, **walk_options(opts, start)))
+        batch = []
+        for fpath in paths:
+            batch.append(fpath)
+            if len(batch) >= SEARCH_BATCH:
+                files_scanned += len(batch)
+                pending.add(pool.submit(_search_batch, batch, pattern, flags, all_matches))
+                batch = []
+                # stream results while still walking; keep the queue bounded
+                if len(pending) >= jobs * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    report(done)
+        if batch:
+            files_scanned += len(batch)
+            pending.add(pool.submit(_search_batch, batch, pattern, flags, all_matches))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            report(done)
+    except KeyboardInterrupt:
+        print("\nSearch interrupted.")
+        pool.shutdown(wait=False, cancel_futures=True)
+        return
+    pool.shutdown()
+    elapsed = max(time.perf_counter() - t0, 1e-6)
+    if not match_count:
         print("No occurrences found.")
+    print(f"{match_count} match(es) in {files_matched} file(s); "
+          f"scanned {files_scanned} files in {elapsed:.2f}s ({files_scanned / elapsed:.0f} files/s)")
+
+# ---- copy engine ----
+COPY_BUF = 8 * 1024 * 1024        # buffer for the read/write fallback (page-aligned via mmap)
+COPY_STEP = 64 * 1024 * 1024      # bytes per kernel copy call, so progress and Ctrl+C stay responsive
+
+def _copy_range(fsrc, fdst, pos, size, progress=None):
+    """Copy bytes [pos, size) between open files, preferring in-kernel copies. Returns bytes copied."""
+    import errno, mmap
+    start = pos
+    infd, outfd = fsrc.fileno(), fdst.fileno()
+    if hasattr(os, "copy_file_range"):
+        try:
+            while pos < size:
+                n = os.copy_file_range(infd, outfd, min(COPY_STEP, size - pos), pos, pos)
+                if n == 0:
+                    break
+                pos += n
+                if progress:
+                    progress.add(n)
+            return pos - start
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                raise
+    if sys.platform.startswith("linux"):
+        try:
+            fdst.seek(pos)
+            while pos < size:
+                n = os.sendfile(outfd, infd, pos, min(COPY_STEP, size - pos))
+                if n == 0:
+                    break
+                pos += n
+                if progress:
+                    progress.add(n)
+            return pos - start
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+    fsrc.seek(pos)
+    fdst.seek(pos)
+    with mmap.mmap(-1, COPY_BUF) as buf:
+        view = memoryview(buf)
+        try:
+            while pos < size:
+                n = fsrc.readinto(view[:min(COPY_BUF, size - pos)])
+                if not n:
+                    break
+                fdst.write(view[:n])
+                pos += n
+                if progress:
+                    progress.add(n)
+        finally:
+            view.release()
+    return pos - start
+
+def _resume_offset(src, dst, src_size):
+    """Offset a partial dst can be resumed from: its length rounded down to COPY_BUF,
+    provided the last whole buffer before that point matches src. 0 means start over."""
+    try:
+        dst_size = os.path.getsize(dst)
+    except OSError:
+        return 0
+    offset = min(dst_size, src_size) // COPY_BUF * COPY_BUF
+    if offset == 0:
+        return 0
+    with open(src, "rb") as a, open(dst, "rb") as b:
+        a.seek(offset - COPY_BUF)
+        b.seek(offset - COPY_BUF)
+        return offset if a.read(COPY_BUF) == b.read(COPY_BUF) else 0
+
+def _path_within(path, root):
+    """True if path is root or lies under it (links resolved, case-insensitive where the OS is).
+    Paths on different drives are never related."""
+    path, root = (os.path.normcase(os.path.realpath(p)) for p in (path, root))
+    if os.path.splitdrive(path)[0] != os.path.splitdrive(root)[0]:
+        return False
+    try:
+        return os.path.commonpath([path, root]) == root
+    except ValueError:
+        return False
+
+def copy_file(src, dst, resume=False, progress=None):
+    """Copy src to dst (contents + metadata, like shutil.copy2). With resume, a partial dst is
+    continued from its last verified offset. Returns bytes written."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    size = os.path.getsize(src)
+    offset = _resume_offset(src, dst, size) if resume else 0
+    if progress and offset:
+        progress.add(offset)
+    with open(src, "rb") as fsrc, open(dst, "r+b" if offset else "wb") as fdst:
+        fdst.truncate(offset)
+        written = _copy_range(fsrc, fdst, offset, size, progress)
+    shutil.copystat(src, dst)
+    return written
+
+def copy_files(pairs, jobs=8, resume=False, progress=True):
+    """Copy [(src, dst, size), ...] on a bounded thread pool with a shared meter. Returns (bytes, errors)."""
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    meter = Progress(sum(size for _, _, size in pairs), enabled=progress)
+    errors = 0
+
+    def collect(done):
+        nonlocal errors
+        for fut in done:
+            try:
+                fut.result()
+            except Exception as e:
+                errors += 1
+                meter.clear()
+                print("copy failed:", e)
+
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    pending = set()
+    try:
+        for path, target, _ in pairs:
+            pending.add(pool.submit(retry_locked, copy_file, path, target, resume, meter))
+            if len(pending) >= jobs * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown()
+        meter.clear()
+    return meter.done, errors
+
+def copy_tree(src, dst, jobs=8, resume=False, progress=True):
+    """Copy directory src to dst with a bounded thread pool. Returns (files, bytes, errors)."""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same directory")
+    if _path_within(dst, src):
+        raise shutil.Error(f"Cannot copy {src!r} into itself ({dst!r})")
+    dirs, files = [src], []
+    for e in walk_tree(src, dirs=True):
+        try:
+            if e.is_dir(follow_symlinks=False):
+                dirs.append(e.path)
+            else:
+                files.append((e.path, os.path.join(dst, os.path.relpath(e.path, src)), e.stat().st_size))
+        except OSError:
+            continue
+    for d in dirs:
+        os.makedirs(os.path.join(dst, os.path.relpath(d, src)), exist_ok=True)
+    nbytes, errors = copy_files(files, jobs=jobs, resume=resume, progress=progress)
+    for d in reversed(dirs):
+        try:
+            shutil.copystat(d, os.path.join(dst, os.path.relpath(d, src)))
+        except OSError:
+            pass
+    return len(files), nbytes, errors
 
 def cmd_copyfile(args=""):
-    parts = args.strip().split(" ", 1)
-    if len(parts) >= 2:
-        src, dst = parts[0], parts[1]
+    """copyfile <src> <dst> [--jobs N] [--resume] — copy a file or folder tree with progress."""
+    pos, opts = parse_opts(args, flags=("--resume",), options=("--jobs", "-j"))
+    if len(pos) >= 2:
+        src, dst = pos[0], " ".join(pos[1:])
     else:
         src = input("Source file: ").strip()
         dst = input("Destination (file or folder): ").strip()
     if not src or not dst:
         return
     src = resolve_path(src); dst = resolve_path(dst)
+    resume = bool(opts.get("resume"))
+    jobs = max(1, opt_int(opts, "jobs", opt_int(opts, "j", 8)))
+    t0 = time.perf_counter()
     try:
         if os.path.isdir(dst):
             dst = os.path.join(dst, os.path.basename(src))
-        shutil.copy2(src, dst)
+        if os.path.isdir(src):
+            count, nbytes, errors = copy_tree(src, dst, jobs=jobs, resume=resume)
+        else:
+            meter = Progress(os.path.getsize(src))
+            try:
+                retry_locked(copy_file, src, dst, resume, meter)
+            finally:
+                meter.clear()
+            count, nbytes, errors = 1, meter.done, 0
+        elapsed = max(time.perf_counter() - t0, 1e-6)
         print("Copied:", src, "->", dst)
+        print(f"{count} file(s), {format_size(nbytes)} in {elapsed:.2f}s ({nbytes / 1048576 / elapsed:.1f} MB/s)"
+              + (f", {errors} error(s)" if errors else ""))
+    except KeyboardInterrupt:
+        print("\nCopy interrupted. Re-run with --resume to continue.")
     except Exception as e:
         print("copyfile failed:", e)
 
+# ---- sync: copy only new/changed files (size + mtime, or --checksum) ----
+SYNC_MTIME_SLOP = 2.0    # seconds; FAT and some network shares store 2 s mtime resolution
+
+def _tree_listing(root):
+    """Files {key: (relpath, size, mtime)} and directories {key: relpath} below root.
+    Keys are os.path.normcase'd relpaths, so trees compare case-insensitively where the OS does."""
+    files, dirs = {}, {}
+    if not os.path.isdir(root):
+        return files, dirs
+    for e in walk_tree(root, dirs=True):
+        rel = os.path.relpath(e.path, root)
+        try:
+            if e.is_dir(follow_symlinks=False):
+                dirs[os.path.normcase(rel)] = rel
+            else:
+                st = e.stat()
+                files[os.path.normcase(rel)] = (rel, st.st_size, st.st_mtime)
+        except OSError:
+            continue
+    return files, dirs
+
+def _under(key, keys):
+    """True if key or one of its parent paths is in keys."""
+    while key:
+        if key in keys:
+            return True
+        key = os.path.dirname(key)
+    return False
+
+def sync_plan(src, dst, checksum=False, delete=False, jobs=8):
+    """Compare trees. Returns dict with 'copy' [(rel, size, reason)], 'delete_files', 'delete_dirs',
+    'mkdirs', 'same' (count) and 'conflicts' (paths that are a file on one side and a folder on the other;
+    with delete the destination side is removed and replaced, otherwise they and everything below are skipped)."""
+    src_files, src_dirs = _tree_listing(src)
+    dst_files, dst_dirs = _tree_listing(dst)
+    clash = (src_files.keys() & dst_dirs.keys()) | (src_dirs.keys() & dst_files.keys())
+    skip = (lambda key: _under(key, clash)) if clash and not delete else (lambda key: False)
+    copy, suspects, same = [], [], 0
+    for key, (rel, size, mtime) in src_files.items():
+        if skip(key):
+            continue
+        other = dst_files.get(key)
+        if other is None:
+            copy.append((rel, size, "new"))
+        elif other[1] != size:
+            copy.append((rel, size, "size"))
+        elif checksum:
+            suspects.append(key)
+        elif abs(other[2] - mtime) > SYNC_MTIME_SLOP:
+            copy.append((rel, size, "mtime"))
+        else:
+            same += 1
+    if suspects:
+        a, _, _, _ = hash_many([os.path.join(src, src_files[k][0]) for k in suspects], "blake2b", jobs=jobs, progress=False)
+        b, _, _, _ = hash_many([os.path.join(dst, dst_files[k][0]) for k in suspects], "blake2b", jobs=jobs, progress=False)
+        for key in suspects:
+            if a.get(os.path.join(src, src_files[key][0])) != b.get(os.path.join(dst, dst_files[key][0])):
+                copy.append((src_files[key][0], src_files[key][1], "hash"))
+            else:
+                same += 1
+    plan = {"copy": sorted(copy), "same": same,
+            "mkdirs": sorted(src_dirs[k] for k in src_dirs.keys() - dst_dirs.keys() if not skip(k)),
+            "conflicts": sorted((src_files.get(k) or (src_dirs[k],))[0] for k in clash),
+            "delete_files": [], "delete_dirs": []}
+    if delete:
+        extra_dirs = dst_dirs.keys() - src_dirs.keys()
+        # only the top-most extra directory of each subtree needs removing
+        plan["delete_dirs"] = sorted(dst_dirs[k] for k in extra_dirs if os.path.dirname(k) not in extra_dirs)
+        plan["delete_files"] = sorted(dst_files[k][0] for k in dst_files.keys() - src_files.keys()
+                                      if os.path.dirname(k) not in extra_dirs)
+    return plan
+
+def cmd_sync(args=""):
+    """sync <src> <dst> [--checksum] [--delete] [--dry-run] [--jobs N] — mirror src into dst, copying only new/changed files."""
+    pos, opts = parse_opts(args, flags=("--checksum", "-c", "--delete", "--dry-run", "-n"), options=("--jobs", "-j"))
+    if len(pos) >= 2:
+        src, dst = pos[0], " ".join(pos[1:])
+    else:
+        src = input("Source folder: ").strip()
+        dst = input("Destination folder: ").strip()
+    if not src or not dst:
+        return
+    src = resolve_path(src); dst = resolve_path(dst)
+    if not os.path.isdir(src):
+        print("Not a directory:", src); return
+    if _path_within(dst, src):
+        print("The destination cannot be inside the source:", dst); return
+    if opts.get("delete") and _path_within(src, dst):
+        print("The source is inside the destination; --delete would remove it:", src); return
+    jobs = max(1, opt_int(opts, "jobs", opt_int(opts, "j", 8)))
+    t0 = time.perf_counter()
+    try:
+        plan = sync_plan(src, dst, checksum=bool(opts.get("checksum") or opts.get("c")),
+                         delete=bool(opts.get("delete")), jobs=jobs)
+    except KeyboardInterrupt:
+        print("\nSync planning interrupted.")
+        return
+    copy_bytes = sum(size for _, size, _ in plan["copy"])
+    print(f"Plan: {src} -> {dst}  (compared in {time.perf_counter() - t0:.2f}s)")
+    for rel, size, reason in plan["copy"][:50]:
+        print(f"  copy   [{reason:5}] {rel} ({format_size(size)})")
+    if len(plan["copy"]) > 50:
+        print(f"  ... and {len(plan['copy']) - 50} more")
+    for rel in plan["delete_dirs"] + plan["delete_files"]:
+        print(f"  delete {rel}")
+    if plan["conflicts"] and not opts.get("delete"):
+        for rel in plan["conflicts"]:
+            print(f"  skip   {rel} (a file on one side, a folder on the other; --delete replaces it)")
+    print(f"{len(plan['copy'])} to copy ({format_size(copy_bytes)}), {plan['same']} unchanged, "
+          f"{len(plan['delete_files']) + len(plan['delete_dirs'])} to delete, {len(plan['mkdirs'])} new folder(s)")
+    if opts.get("dry_run") or opts.get("n"):
+        return
+    if not plan["copy"] and not plan["mkdirs"] and not plan["delete_files"] and not plan["delete_dirs"]:
+        print("Already in sync.")
+        return
+    if plan["delete_files"] or plan["delete_dirs"]:
+        confirm = input(f"Type YES to sync and delete extras in {dst}: ").strip()
+        if confirm.upper() != "YES":
+            print("Aborted."); return
+    t0 = time.perf_counter()
+    pairs, nbytes, errors, deleted = [], 0, 0, 0
+    try:
+        os.makedirs(dst, exist_ok=True)
+        # deletions first: a folder replacing a file (or the reverse) needs the old entry gone
+        for rel in plan["delete_files"]:
+            try:
+                retry_locked(_unlink, os.path.join(dst, rel))
+                deleted += 1
+            except OSError as e:
+                errors += 1
+                print("delete failed:", e)
+        for rel in plan["delete_dirs"]:
+            removed, failed = delete_tree(os.path.join(dst, rel), jobs=jobs, progress=False)
+            deleted += removed
+            errors += failed
+        for rel in plan["mkdirs"]:
+            try:
+                os.makedirs(os.path.join(dst, rel), exist_ok=True)
+            except OSError as e:
+                errors += 1
+                print("mkdir failed:", e)
+        pairs = [(os.path.join(src, rel), os.path.join(dst, rel), size) for rel, size, _ in plan["copy"]]
+        nbytes, failed = copy_files(pairs, jobs=jobs)
+        errors += failed
+    except KeyboardInterrupt:
+        print("\nSync interrupted; re-run to finish.")
+        return
+    elapsed = max(time.perf_counter() - t0, 1e-6)
+    print(f"Synced: {len(pairs)} file(s) copied, {format_size(nbytes)} in {elapsed:.2f}s "
+          f"({nbytes / 1048576 / elapsed:.1f} MB/s), {deleted} deleted, {errors} error(s)")
+
 def cmd_movefile(args=""):
     parts = args.strip().split(" ", 1)
     if len(parts) >= 2:
@@ -1106,99 +3971,1001 @@ def cmd_movefile(args=""):
     except Exception as e:
         print("movefile failed:", e)
 
+# ---- delete engine ----
+def _unlink(path):
+    """Remove a file or link (junctions included), clearing the read-only attribute if that is
+    what blocks it (Windows; links are left alone so their targets are never modified)."""
+    try:
+        os.unlink(path)
+    except PermissionError:
+        import stat
+        if not IS_WINDOWS or _is_link_path(path):
+            raise
+        os.chmod(path, os.lstat(path).st_mode | stat.S_IWRITE)
+        os.unlink(path)
+
+def scan_for_delete(path):
+    """Walk path with scandir without following links or junctions (those are removed, not entered).
+    Returns (non-dir paths, [(depth, dir)], bytes)."""
+    files, dirs, nbytes = [], [(0, path)], 0
+    stack = [(0, path)]
+    while stack:
+        depth, d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    try:
+                        if e.is_dir(follow_symlinks=False) and not _is_link_entry(e):
+                            stack.append((depth + 1, e.path))
+                            dirs.append((depth + 1, e.path))
+                        else:
+                            files.append(e.path)
+                            nbytes += e.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        files.append(e.path)
+        except OSError:
+            continue
+    return files, dirs, nbytes
+
+def delete_tree(path, jobs=8, progress=True):
+    """Delete a directory tree: unlink files across a thread pool, then remove directories
+    deepest level first, each level in parallel. Returns (entries removed, errors)."""
+    from concurrent.futures import ThreadPoolExecutor
+    if _is_link_path(path):
+        retry_locked(_unlink, path)   # a junction/link: remove the link, not what it points to
+        return 1, 0
+    files, dirs, _ = scan_for_delete(path)
+    meter = Progress(len(files) + len(dirs), enabled=progress, unit="entries")
+    removed = errors = 0
+
+    def run(fn, paths):
+        nonlocal removed, errors
+        for fut in [pool.submit(retry_locked, fn, p) for p in paths]:
+            try:
+                fut.result()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                errors += 1
+                meter.clear()
+                print("delete failed:", e)
+            meter.add(1)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        try:
+            for i in range(0, len(files), 10000):
+                run(_unlink, files[i:i + 10000])
+            by_depth = {}
+            for depth, d in dirs:
+                by_depth.setdefault(depth, []).append(d)
+            for depth in sorted(by_depth, reverse=True):
+                run(os.rmdir, by_depth[depth])
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            meter.clear()
+    return removed, errors
+
+def remove_path(target, jobs=8):
+    """Delete a file, link or directory tree; prints a summary line for trees."""
+    if os.path.isdir(target) and not _is_link_path(target):
+        t0 = time.perf_counter()
+        removed, errors = delete_tree(target, jobs=jobs)
+        elapsed = max(time.perf_counter() - t0, 1e-6)
+        print(f"{removed} entries removed in {elapsed:.2f}s ({removed / elapsed:.0f}/s)"
+              + (f", {errors} error(s)" if errors else ""))
+        if errors:
+            raise OSError(f"{errors} entries could not be removed")
+    else:
+        retry_locked(_unlink, target)
+
 def cmd_deletefile(args=""):
-    target = args.strip() or input("File to delete: ").strip()
+    """deletefile <path> [--dry-run] [--jobs N] — delete a file or folder tree (asks for YES)."""
+    pos, opts = parse_opts(args, flags=("--dry-run", "-n"), options=("--jobs", "-j"))
+    target = " ".join(pos) or input("File to delete: ").strip()
     if not target:
         return
     target = resolve_path(target)
-    if not os.path.exists(target):
+    if not os.path.lexists(target):
         print("Not found:", target); return
+    if opts.get("dry_run") or opts.get("n"):
+        if os.path.isdir(target) and not _is_link_path(target):
+            files, dirs, nbytes = scan_for_delete(target)
+            print(f"Would delete {len(files)} file(s) and {len(dirs)} folder(s), {format_size(nbytes)}: {target}")
+        else:
+            print(f"Would delete 1 file, {format_size(os.lstat(target).st_size)}: {target}")
+        return
     confirm = input(f"Type YES to delete {target}: ").strip()
     if confirm.upper() != "YES":
         print("Aborted."); return
     try:
-        if os.path.isdir(target):
-            shutil.rmtree(target)
-        else:
-            os.remove(target)
+        remove_path(target, jobs=max(1, opt_int(opts, "jobs", opt_int(opts, "j", 8))))
         print("Deleted:", target)
+    except KeyboardInterrupt:
+        print("\nDelete interrupted; some entries remain.")
     except Exception as e:
         print("deletefile failed:", e)
 
+# ---- parallel zip engine ----
+ZIP_CHUNK = 16 * 1024 * 1024      # members are deflated in independent chunks of this size
+ZIP_STORE_EXTS = {".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst", ".jpg", ".jpeg", ".png",
+                  ".gif", ".webp", ".mp3", ".mp4", ".mkv", ".avi", ".mov", ".m4a", ".ogg", ".docx",
+                  ".xlsx", ".pptx", ".jar", ".whl", ".apk"}
+
+def _gf2_times(mat, vec):
+    total, i = 0, 0
+    while vec:
+        if vec & 1:
+            total ^= mat[i]
+        vec >>= 1
+        i += 1
+    return total
+
+def crc32_combine(crc1, crc2, len2):
+    """CRC-32 of A+B from crc32(A), crc32(B) and len(B) (port of zlib's crc32_combine)."""
+    if len2 <= 0:
+        return crc1
+    odd = [0xEDB88320] + [1 << (n - 1) for n in range(1, 32)]
+    even = [_gf2_times(odd, v) for v in odd]
+    odd = [_gf2_times(even, v) for v in even]
+    while True:
+        even = [_gf2_times(odd, v) for v in odd]
+        if len2 & 1:
+            crc1 = _gf2_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = [_gf2_times(even, v) for v in even]
+        if len2 & 1:
+            crc1 = _gf2_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+    return crc1 ^ crc2
+
+def _zip_chunk(path, offset, length, level, last):
+    """Worker: read one chunk and raw-deflate it (level None = store).
+    Non-final chunks end on a sync flush so the pieces concatenate into one valid deflate stream."""
+    import zlib
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    crc = zlib.crc32(data)
+    if level is None:
+        return data, crc, len(data)
+    c = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH), crc, len(data)
+
+def _zip_entry(fpath, arcname, stored):
+    """Header fields for a new member; names and timestamps come from ZipInfo.from_file."""
+    zi = zipfile.ZipInfo.from_file(fpath, arcname, strict_timestamps=False)
+    try:
+        name, flags = zi.filename.encode("ascii"), 0
+    except UnicodeEncodeError:
+        name, flags = zi.filename.encode("utf-8"), 0x800
+    y, mo, d, h, mi, sec = zi.date_time
+    return {"name": name, "flags": flags, "method": zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED,
+            "time": (h << 11) | (mi << 5) | (sec // 2), "date": ((y - 1980) << 9) | (mo << 5) | d,
+            "system": zi.create_system, "attr": zi.external_attr, "crc": 0, "size": 0, "csize": 0, "offset": 0}
+
+def _zip_local_header(e, zip64):
+    """Local file header; with zip64 the sizes live in a ZIP64 extra field (fixed length, so it can be rewritten)."""
+    import struct
+    extra = struct.pack("<HHQQ", 1, 16, e["size"], e["csize"]) if zip64 else b""
+    size, csize = (0xFFFFFFFF, 0xFFFFFFFF) if zip64 else (e["size"], e["csize"])
+    return struct.pack("<IHHHHHIIIHH", 0x04034B50, 45 if zip64 else 20, e["flags"], e["method"], e["time"],
+                       e["date"], e["crc"], csize, size, len(e["name"]), len(extra)) + e["name"] + extra
+
+def _zip_central_record(e):
+    """Central directory record, with a ZIP64 extra field for whichever values overflow 32 bits."""
+    import struct
+    big = [v for v in (e["size"], e["csize"], e["offset"]) if v >= 0xFFFFFFFF]
+    extra = struct.pack(f"<HH{len(big)}Q", 1, 8 * len(big), *big) if big else b""
+    size, csize, offset = (min(v, 0xFFFFFFFF) for v in (e["size"], e["csize"], e["offset"]))
+    version = 45 if big else 20
+    return struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, (e["system"] << 8) | version, version, e["flags"],
+                       e["method"], e["time"], e["date"], e["crc"], csize, size, len(e["name"]), len(extra),
+                       0, 0, 0, e["attr"], offset) + e["name"] + extra
+
+def _zip_end_records(count, cd_start, cd_end):
+    """End of central directory record, preceded by the ZIP64 end record and locator when needed."""
+    import struct
+    cd_size = cd_end - cd_start
+    out = b""
+    if count >= 0xFFFF or cd_start >= 0xFFFFFFFF or cd_size >= 0xFFFFFFFF:
+        out += struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_start)
+        out += struct.pack("<IIQI", 0x07064B50, 0, cd_end, 1)
+    count = min(count, 0xFFFF)
+    return out + struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, min(cd_size, 0xFFFFFFFF),
+                             min(cd_start, 0xFFFFFFFF), 0)
+
+def zip_parallel(dest, members, level=6, store=False, jobs=None, progress=True):
+    """Write members [(path, arcname, size), ...] to dest, deflating chunks in a process pool.
+    The parent appends finished streams in order and writes the zip headers itself (zipfile has
+    no public API for adding pre-compressed data). A failed run removes dest. Returns (bytes_in, bytes_out)."""
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    jobs = jobs or os.cpu_count() or 1
+    meter = Progress(sum(m[2] for m in members), enabled=progress)
+
+    def chunks():
+        for fpath, arcname, size in members:
+            stored = store or os.path.splitext(arcname)[1].lower() in ZIP_STORE_EXTS
+            n = max(1, -(-size // ZIP_CHUNK))
+            for i in range(n):
+                yield fpath, arcname, size, stored, i, i == n - 1
+
+    # one job needs no worker processes; zlib releases the GIL so a thread is enough
+    Executor = ThreadPoolExecutor if jobs == 1 else ProcessPoolExecutor
+    try:
+        with open(dest, "wb") as f, Executor(max_workers=jobs) as pool:
+            todo, window, entries = chunks(), deque(), []
+
+            def fill():
+                while len(window) < jobs * 2:
+                    item = next(todo, None)
+                    if item is None:
+                        return
+                    fpath, _, _, stored, i, last = item
+                    window.append((item, pool.submit(_zip_chunk, fpath, i * ZIP_CHUNK, ZIP_CHUNK,
+                                                     None if stored else level, last)))
+
+            try:
+                fill()
+                entry = zip64 = None
+                while window:
+                    (fpath, arcname, size, stored, i, last), fut = window.popleft()
+                    fill()
+                    payload, crc, n = fut.result()
+                    if i == 0:
+                        # placeholder header, rewritten with the real CRC and sizes once the member is done
+                        entry = _zip_entry(fpath, arcname, stored)
+                        entry["offset"] = f.tell()
+                        zip64 = size * 1.05 > zipfile.ZIP64_LIMIT
+                        f.write(_zip_local_header(entry, zip64))
+                    f.write(payload)
+                    entry["crc"] = crc32_combine(entry["crc"], crc, n) if entry["size"] else crc
+                    entry["size"] += n
+                    entry["csize"] += len(payload)
+                    meter.add(n)
+                    if last:
+                        if not zip64 and max(entry["size"], entry["csize"]) >= 0xFFFFFFFF:
+                            raise zipfile.LargeZipFile(f"{arcname} grew past 4 GiB while being compressed")
+                        end = f.tell()
+                        f.seek(entry["offset"])
+                        f.write(_zip_local_header(entry, zip64))
+                        f.seek(end)
+                        entries.append(entry)
+                cd_start = f.tell()
+                for entry in entries:
+                    f.write(_zip_central_record(entry))
+                f.write(_zip_end_records(len(entries), cd_start, f.tell()))
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                meter.clear()
+    except BaseException:
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        raise
+    return meter.done, os.path.getsize(dest)
+
 def cmd_compress(args=""):
-    """compress <path> -> creates path.zip in current dir (or specified dest if provided)"""
-    parts = args.strip().split(" ", 1)
-    if not parts[0]:
+    """compress <path> [dest] [--level 0-9] [--store] [--jobs N] [walk options] -> creates path.zip in current dir (or dest)"""
+    pos, opts = parse_opts(args, flags=("--store",) + WALK_FLAGS, options=("--level", "--jobs", "-j") + WALK_OPTIONS)
+    if not pos:
         p = input("Folder/file to compress: ").strip()
     else:
-        p = parts[0]
+        p = pos[0]
     p = resolve_path(p)
     if not os.path.exists(p):
         print("Not found:", p); return
     base = os.path.basename(p.rstrip(os.sep))
-    dest = parts[1].strip() if len(parts) > 1 and parts[1].strip() else f"{base}.zip"
+    dest = " ".join(pos[1:]).strip() or f"{base}.zip"
     dest = resolve_path(dest)
+    level = min(9, max(0, opt_int(opts, "level", 6)))
+    store = bool(opts.get("store")) or level == 0
+    jobs = max(1, opt_int(opts, "jobs", opt_int(opts, "j", os.cpu_count() or 1)))
+    if os.path.isdir(p):
+        members = []
+        for e in walk_tree(p, **walk_options(opts, p)):
+            if e.path == dest:
+                continue
+            try:
+                members.append((e.path, os.path.relpath(e.path, os.path.dirname(p)), e.stat().st_size))
+            except OSError:
+                continue
+        members.sort(key=lambda m: m[1])
+    else:
+        members = [(p, os.path.basename(p), os.path.getsize(p))]
+    t0 = time.perf_counter()
     try:
-        with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as z:
-            if os.path.isdir(p):
-                for root, dirs, files in os.walk(p):
-                    for fname in files:
-                        fpath = os.path.join(root, fname)
-                        arcname = os.path.relpath(fpath, os.path.dirname(p))
-                        z.write(fpath, arcname)
-            else:
-                z.write(p, os.path.basename(p))
-        print("Created zip:", dest)
+        size_in, size_out = zip_parallel(dest, members, level=level, store=store, jobs=jobs)
+    except KeyboardInterrupt:
+        print("\nCompression interrupted; partial archive removed.")
+        return
     except Exception as e:
         print("compress failed:", e)
+        return
+    elapsed = max(time.perf_counter() - t0, 1e-6)
+    print("Created zip:", dest)
+    ratio = size_out / size_in if size_in else 1.0
+    print(f"{len(members)} file(s), {format_size(size_in)} -> {format_size(size_out)} ({ratio:.1%}) "
+          f"in {elapsed:.2f}s ({size_in / 1048576 / elapsed:.1f} MB/s, {jobs} job(s), "
+          f"{'store' if store else f'level {level}'})")
+
+# ---- extraction engine ----
+def _zip_target(dest, name):
+    """Where ZipFile.extract() puts member name under dest (same sanitizing rules)."""
+    arcname = name.replace("/", os.sep)
+    if os.altsep:
+        arcname = arcname.replace(os.altsep, os.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    arcname = os.sep.join(x for x in arcname.split(os.sep) if x not in ("", os.curdir, os.pardir))
+    if IS_WINDOWS:
+        # characters Windows forbids become '_'; trailing dots are dropped from each part
+        arcname = arcname.translate(str.maketrans(':<>|"?*', "_______"))
+        arcname = os.sep.join(x for x in (x.rstrip(".") for x in arcname.split(os.sep)) if x)
+    return os.path.join(dest, arcname)
+
+def _zip_up_to_date(info, target):
+    """True if target already has the member's size and CRC."""
+    import zlib
+    try:
+        if os.path.getsize(target) != info.file_size:
+            return False
+        crc = 0
+        with open(target, "rb") as f:
+            while True:
+                buf = f.read(1024 * 1024)
+                if not buf:
+                    break
+                crc = zlib.crc32(buf, crc)
+        return crc == info.CRC
+    except OSError:
+        return False
+
+def unzip_parallel(zfile, dest, members, jobs=None, skip_same=True, progress=True):
+    """Extract members (ZipInfo list) with a thread pool; each worker thread has its own ZipFile handle.
+    All directories are created up front, so workers only write file data. CRCs are verified
+    while reading. Returns (extracted, skipped, failed, bytes_extracted)."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    jobs = jobs or min(8, (os.cpu_count() or 1) * 2)
+    local, handles = threading.local(), []
+    lock = threading.Lock()
+
+    def work(info):
+        target = _zip_target(dest, info.filename)
+        if skip_same and _zip_up_to_date(info, target):
+            return "skipped", info
+        z = getattr(local, "z", None)
+        if z is None:
+            z = local.z = zipfile.ZipFile(zfile)
+            with lock:
+                handles.append(z)
+        with z.open(info) as src, open(target, "wb") as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+        return "extracted", info
+
+    counts = {"extracted": 0, "skipped": 0, "failed": 0}
+    out_bytes = 0
+    files = [i for i in members if not i.is_dir()]
+    # make every directory (explicit entries and implied parents) here, once, so no two
+    # workers ever call makedirs on the same path; archives need not contain dir entries
+    folders = {_zip_target(dest, i.filename) for i in members if i.is_dir()}
+    folders.update(os.path.dirname(_zip_target(dest, i.filename)) for i in files)
+    bad = set()
+    for d in sorted(folders):
+        try:
+            os.makedirs(d, exist_ok=True)
+        except OSError as e:
+            bad.add(d)
+            print(f"{d}: {e}")
+    for i in members:
+        if i.is_dir():
+            counts["failed" if _zip_target(dest, i.filename) in bad else "extracted"] += 1
+    meter = Progress(sum(i.file_size for i in files), enabled=progress)
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        futures = {pool.submit(work, i): i for i in files}
+        for fut in as_completed(futures):
+            info = futures[fut]
+            try:
+                state, _ = fut.result()
+            except Exception as e:
+                state = "failed"
+                meter.clear()
+                print(f"{info.filename}: {e}")
+            counts[state] += 1
+            if state == "extracted":
+                out_bytes += info.file_size
+            meter.add(info.file_size)
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown()
+        meter.clear()
+        for z in handles:
+            z.close()
+    return counts["extracted"], counts["skipped"], counts["failed"], out_bytes
+
+def _extract_member(zfile, name, to):
+    """Stream one member to stdout ('-' or empty) or to a file without unpacking the rest."""
+    with zipfile.ZipFile(zfile) as z:
+        try:
+            info = z.getinfo(name)
+        except KeyError:
+            print("No such member:", name); return
+        with z.open(info) as src:
+            if not to or to == "-":
+                shutil.copyfileobj(src, sys.stdout.buffer, 1024 * 1024)
+                sys.stdout.flush()
+            else:
+                to = resolve_path(to)
+                if os.path.isdir(to):
+                    to = os.path.join(to, os.path.basename(name))
+                with open(to, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                print(f"Wrote {name} -> {to} ({format_size(info.file_size)})")
 
 def cmd_extract(args=""):
-    zfile = args.strip() or input("Zip file to extract: ").strip()
+    """extract <zip> [dest] [--include glob,..] [--exclude glob,..] [--jobs N] [--force] [--list]
+    extract <zip> --member <name> [--to <file>|-] — stream one member to a file or stdout."""
+    pos, opts = parse_opts(args, flags=("--force", "--list"),
+                           options=("--include", "--exclude", "--jobs", "-j", "--member", "--to"))
+    zfile = pos[0] if pos else input("Zip file to extract: ").strip()
     if not zfile:
         return
+    dest = None
+    if len(pos) > 1 and not os.path.exists(resolve_path(" ".join(pos))):
+        dest = " ".join(pos[1:])
+    elif len(pos) > 1:
+        zfile = " ".join(pos)
     zfile = resolve_path(zfile)
     if not os.path.exists(zfile):
         print("Not found:", zfile); return
-    dest = input("Destination folder (default current): ").strip() or "."
-    dest = resolve_path(dest)
     try:
+        if opts.get("member"):
+            _extract_member(zfile, opts["member"], opts.get("to"))
+            return
         with zipfile.ZipFile(zfile, "r") as z:
-            z.extractall(dest)
+            infos = z.infolist()
+        includes = [g for g in opts.get("include", "").split(",") if g]
+        excludes = [g for g in opts.get("exclude", "").split(",") if g]
+        if includes:
+            infos = [i for i in infos if any(glob.fnmatch.fnmatch(i.filename, g) for g in includes)]
+        if excludes:
+            infos = [i for i in infos if not any(glob.fnmatch.fnmatch(i.filename, g) for g in excludes)]
+        if opts.get("list"):
+            for i in infos:
+                print(f"{i.file_size:>12}  {i.filename}")
+            print(f"{len(infos)} member(s), {format_size(sum(i.file_size for i in infos))}")
+            return
+        if dest is None:
+            dest = input("Destination folder (default current): ").strip() or "."
+        dest = resolve_path(dest)
+        jobs = opt_int(opts, "jobs", opt_int(opts, "j", 0)) or None
+        t0 = time.perf_counter()
+        extracted, skipped, failed, nbytes = unzip_parallel(zfile, dest, infos, jobs=jobs,
+                                                            skip_same=not opts.get("force"))
+        elapsed = max(time.perf_counter() - t0, 1e-6)
         print("Extracted to:", dest)
+        print(f"{extracted} extracted, {skipped} unchanged (skipped), {failed} failed; "
+              f"{format_size(nbytes)} in {elapsed:.2f}s ({nbytes / 1048576 / elapsed:.1f} MB/s)")
+    except KeyboardInterrupt:
+        print("\nExtraction interrupted.")
     except Exception as e:
         print("extract failed:", e)
 
 def cmd_filesize(args=""):
-    f = args.strip() or input("File to show size: ").strip()
+    """filesize <file> | filesize --recursive <dir> [du options]"""
+    pos, opts = parse_opts(args, flags=("--recursive", "-r") + DU_FLAGS, options=DU_OPTIONS)
+    if opts.get("recursive") or opts.get("r"):
+        return du_report(resolve_path(" ".join(pos) or "."), opts)
+    f = " ".join(pos) or input("File to show size: ").strip()
     if not f: return
     f = resolve_path(f)
     if not os.path.exists(f):
         print("Not found:", f); return
-    size = os.path.getsize(f)
-    units = ["B","KB","MB","GB","TB"]
-    i = 0
-    while size >= 1024 and i < len(units)-1:
-        size /= 1024.0
-        i += 1
-    print(f"{f}: {size:.2f} {units[i]}")
+    print(f"{f}: {format_size(os.path.getsize(f))}")
+    if os.path.isdir(f):
+        print("(directory entry only; use 'du' or 'filesize --recursive' for contents)")
+
+# ---- du: recursive size analyzer with a per-directory cache (table 'du' in INDEX_PATH) ----
+DU_TOP_FILES = 20     # largest files remembered per directory
+DU_FLAGS = ("--no-cache",)
+DU_OPTIONS = ("-n", "--jobs", "-j")
+
+def _du_dir(path, cached):
+    """Size one directory's own files. Reuses the cached record when the directory mtime is unchanged
+    (adding, removing or renaming entries changes it; a file growing in place does not, so such
+    changes are only seen with --no-cache). Returns (path, mtime, bytes, files, subdirs, top_files, from_cache)."""
+    import heapq
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return path, None, 0, 0, [], [], False
+    if cached and cached[0] == mtime:
+        return (path, mtime) + tuple(cached[1:]) + (True,)
+    nbytes = nfiles = 0
+    subdirs, top = [], []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        subdirs.append(e.name)
+                        continue
+                    size = e.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+                nbytes += size
+                nfiles += 1
+                if len(top) < DU_TOP_FILES:
+                    heapq.heappush(top, (size, e.name))
+                elif size > top[0][0]:
+                    heapq.heapreplace(top, (size, e.name))
+    except OSError:
+        pass
+    return path, mtime, nbytes, nfiles, subdirs, top, False
+
+def du_scan(root, jobs=16, use_cache=True):
+    """Parallel scandir walk of root. Returns {dir: (own_bytes, own_files, subdirs, top_files)}, cache hits."""
+    import json
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    db = _index_open()
+    try:
+        cache = {}
+        if use_cache:
+            where, params = _index_under("path", root)
+            for path, mtime, nbytes, nfiles, subdirs, top in db.execute(
+                    f"SELECT path, mtime, bytes, files, subdirs, top FROM du WHERE {where}", params):
+                cache[path] = (mtime, nbytes, nfiles, json.loads(subdirs), [tuple(t) for t in json.loads(top)])
+        result, changed, hits = {}, [], 0
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            pending = {pool.submit(_du_dir, root, cache.get(root))}
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        path, mtime, nbytes, nfiles, subdirs, top, from_cache = fut.result()
+                        if mtime is None:
+                            continue
+                        result[path] = (nbytes, nfiles, subdirs, top)
+                        if from_cache:
+                            hits += 1
+                        else:
+                            changed.append((path, mtime, nbytes, nfiles, json.dumps(subdirs), json.dumps(top)))
+                        for name in subdirs:
+                            child = os.path.join(path, name)
+                            pending.add(pool.submit(_du_dir, child, cache.get(child)))
+            except BaseException:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        db.executemany("INSERT OR REPLACE INTO du VALUES (?, ?, ?, ?, ?, ?)", changed)
+        db.executemany("DELETE FROM du WHERE path = ?", [(p,) for p in cache if p not in result])
+        db.commit()
+        return result, hits
+    finally:
+        db.close()
+
+def cmd_du(args=""):
+    """du [path] [-n N] [--jobs N] [--no-cache] — recursive size with heaviest subdirectories and files."""
+    pos, opts = parse_opts(args, flags=DU_FLAGS, options=DU_OPTIONS)
+    du_report(resolve_path(" ".join(pos) or "."), opts)
+
+def du_report(root, opts):
+    if not os.path.isdir(root):
+        if os.path.exists(root):
+            print(f"{root}: {format_size(os.path.getsize(root))}")
+        else:
+            print("Not found:", root)
+        return
+    limit = max(1, opt_int(opts, "n", 10))
+    t0 = time.perf_counter()
+    try:
+        tree, hits = du_scan(root, jobs=max(1, opt_int(opts, "jobs", opt_int(opts, "j", 16))),
+                             use_cache=not opts.get("no_cache"))
+    except KeyboardInterrupt:
+        print("\ndu interrupted.")
+        return
+    elapsed = time.perf_counter() - t0
+    # roll totals up from the deepest directories
+    totals = {}
+    for d in sorted(tree, key=lambda p: p.count(os.sep), reverse=True):
+        nbytes, nfiles, subdirs, _ = tree[d]
+        for name in subdirs:
+            cb, cf = totals.get(os.path.join(d, name), (0, 0))
+            nbytes += cb
+            nfiles += cf
+        totals[d] = (nbytes, nfiles)
+    if root not in totals:
+        print("Cannot read", root); return
+    total_bytes, total_files = totals[root]
+    print(f"{root}: {format_size(total_bytes)} in {total_files} file(s), {len(tree)} folder(s)")
+    print(f"Scanned in {elapsed:.2f}s ({hits}/{len(tree)} folders unchanged, served from cache"
+          f"{'; files rewritten in place are only seen with --no-cache' if hits else ''})")
+    children = [(totals[os.path.join(root, n)][0], os.path.join(root, n))
+                for n in tree[root][2] if os.path.join(root, n) in totals]
+    if children:
+        print(f"\nTop {min(limit, len(children))} subdirectories:")
+        for size, path in sorted(children, reverse=True)[:limit]:
+            print(f"  {format_size(size):>12}  {path}")
+    files = sorted(((size, os.path.join(d, name)) for d, rec in tree.items() for size, name in rec[3]),
+                   reverse=True)[:limit]
+    if files:
+        print(f"\nTop {len(files)} files:")
+        for size, path in files:
+            print(f"  {format_size(size):>12}  {path}")
 
 def cmd_recent(args=""):
-    path = args.strip() or "."
-    path = resolve_path(path)
+    """recent [path] [-n N] [--ext .py,.log] [--max-age 2h] [--min-age 1d] [--since <timestamp>] [walk options] — newest files first."""
+    import heapq
+    pos, opts = parse_opts(args, flags=WALK_FLAGS, options=("-n", "--ext", "--max-age", "--min-age", "--since") + WALK_OPTIONS)
+    path = resolve_path(" ".join(pos) or ".")
     if not os.path.isdir(path):
         print("Not a directory:", path); return
-    items = []
-    for root, dirs, files in os.walk(path):
-        for fname in files:
-            fpath = os.path.join(root, fname)
+    limit = max(1, opt_int(opts, "n", 50))
+    exts = tuple(e.strip().lower() if e.strip().startswith(".") else "." + e.strip().lower()
+                 for e in opts.get("ext", "").split(",") if e.strip())
+    now = time.time()
+    newer_than, older_than = None, None
+    try:
+        if opts.get("max_age"):
+            newer_than = now - parse_age(opts["max_age"])
+        if opts.get("since"):
+            since = parse_timestamp(opts["since"])
+            newer_than = since if newer_than is None else max(newer_than, since)
+        if opts.get("min_age"):
+            older_than = now - parse_age(opts["min_age"])
+    except ValueError as e:
+        print("Invalid age/timestamp:", e); return
+
+    # bounded min-heap of (mtime, path): O(n log N) time, O(N) memory
+    heap, matched = [], 0
+    try:
+        for e in walk_tree(path, **walk_options(opts, path)):
+            if exts and not e.name.lower().endswith(exts):
+                continue
             try:
-                mtime = os.path.getmtime(fpath)
-                items.append((mtime, fpath))
-            except Exception:
+                mtime = e.stat().st_mtime
+            except OSError:
+                continue
+            if newer_than is not None and mtime <= newer_than:
                 continue
-    items.sort(reverse=True)
-    for mtime, fpath in items[:50]:
+            if older_than is not None and mtime > older_than:
+                continue
+            matched += 1
+            if len(heap) < limit:
+                heapq.heappush(heap, (mtime, e.path))
+            elif mtime > heap[0][0]:
+                heapq.heapreplace(heap, (mtime, e.path))
+    except KeyboardInterrupt:
+        print("\nScan interrupted; showing partial results.")
+    for mtime, fpath in sorted(heap, reverse=True):
         print(datetime.datetime.fromtimestamp(mtime).isoformat(), fpath)
+    if newer_than is not None or older_than is not None or matched > limit:
+        print(f"({len(heap)} of {matched} matching file(s) shown)")
+
+# ---- duplicate finder: size -> partial hash -> full hash ----
+DUPES_EDGE = 64 * 1024    # bytes hashed from each end of a file in the partial pass
+
+def _partial_hash(path, size):
+    """Hash of the first and last DUPES_EDGE bytes (the whole file when it is small enough)."""
+    import hashlib
+    h = hashlib.blake2b()
+    with open(path, "rb") as f:
+        h.update(f.read(DUPES_EDGE))
+        if size > 2 * DUPES_EDGE:
+            f.seek(size - DUPES_EDGE)
+            h.update(f.read(DUPES_EDGE))
+        elif size > DUPES_EDGE:
+            h.update(f.read())
+    return h.hexdigest()
+
+def _safe(fn, path, size):
+    """fn(path, size), or None if the file vanished or cannot be read."""
+    try:
+        return fn(path, size)
+    except OSError:
+        return None
+
+def find_dupes(root, min_size=1, jobs=8, walk_kwargs=None):
+    """Return duplicate groups [(size, [paths...]), ...] below root.
+    Files are grouped by size, then by a partial hash; only files that still collide get a
+    full hash. Hardlinks to the same inode count once."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def regroup(groups, keyfn):
+        out = []
+        for size, paths in groups:
+            buckets = {}
+            for path, key in zip(paths, pool.map(lambda p: _safe(keyfn, p, size), paths)):
+                if key is not None:
+                    buckets.setdefault(key, []).append(path)
+            out.extend((size, b) for b in buckets.values() if len(b) > 1)
+        return out
+
+    by_size = {}
+    for e in walk_tree(root, **(walk_kwargs or {})):
+        try:
+            size = e.stat().st_size
+        except OSError:
+            continue
+        if size >= min_size:
+            by_size.setdefault(size, []).append(e.path)
+    groups = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        inodes = {}
+        for p in paths:
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            inodes.setdefault((st.st_dev, st.st_ino) if st.st_ino else p, p)
+        if len(inodes) > 1:
+            groups.append((size, sorted(inodes.values())))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        groups = regroup(groups, _partial_hash)
+        small = [g for g in groups if g[0] <= 2 * DUPES_EDGE]   # partial hash already covered all bytes
+        large = regroup([g for g in groups if g[0] > 2 * DUPES_EDGE], lambda p, size: hash_file(p))
+    return small + large
+
+def _dedupe_link(keep, path):
+    """Replace path with a hardlink to keep (link to a temp name first, then swap)."""
+    tmp = f"{path}.venomlink"
+    os.link(keep, tmp)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        os.unlink(tmp)
+        raise
+
+def cmd_dupes(args=""):
+    """dupes <path> [--min-size 1K] [--jobs N] [--delete | --hardlink] [walk options] — find duplicate files."""
+    pos, opts = parse_opts(args, flags=("--delete", "--hardlink") + WALK_FLAGS,
+                           options=("--min-size", "--jobs", "-j") + WALK_OPTIONS)
+    path = " ".join(pos) or input("Folder to scan for duplicates (default .): ").strip() or "."
+    root = resolve_path(path)
+    if not os.path.isdir(root):
+        print("Not a directory:", root); return
+    try:
+        min_size = parse_size(opts.get("min_size", "1"))
+    except ValueError:
+        print("Invalid --min-size."); return
+    t0 = time.perf_counter()
+    try:
+        groups = find_dupes(root, min_size=max(1, min_size), jobs=max(1, opt_int(opts, "jobs", opt_int(opts, "j", 8))),
+                            walk_kwargs=walk_options(opts, root))
+    except KeyboardInterrupt:
+        print("\nDuplicate scan interrupted.")
+        return
+    if not groups:
+        print(f"No duplicates found ({time.perf_counter() - t0:.2f}s).")
+        return
+
+    seen = {}   # path -> (size, mtime_ns) when reported; re-checked before acting
+
+    def keep_first(paths):
+        # keep the oldest copy; the others are the "wasted" ones. Files gone since hashing drop out.
+        for p in paths:
+            try:
+                st = os.stat(p)
+                seen[p] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                pass
+        return sorted((p for p in paths if p in seen), key=lambda p: (seen[p][1], p))
+
+    groups = [(size, paths) for size, paths in ((size, keep_first(paths)) for size, paths in groups) if len(paths) > 1]
+    if not groups:
+        print(f"No duplicates found ({time.perf_counter() - t0:.2f}s).")
+        return
+    groups.sort(key=lambda g: g[0] * (len(g[1]) - 1), reverse=True)
+    wasted = 0
+    for size, paths in groups:
+        waste = size * (len(paths) - 1)
+        wasted += waste
+        print(f"\n{len(paths)} copies x {format_size(size)} — wasted {format_size(waste)}")
+        for i, p in enumerate(paths):
+            print(("  keep " if i == 0 else "       ") + p)
+    extra = sum(len(paths) - 1 for _, paths in groups)
+    print(f"\n{len(groups)} group(s), {extra} redundant file(s), {format_size(wasted)} wasted "
+          f"({time.perf_counter() - t0:.2f}s)")
+
+    action = "delete" if opts.get("delete") else "hardlink" if opts.get("hardlink") else None
+    if not action:
+        return
+    confirm = input(f"Type YES to {action} {extra} redundant file(s): ").strip()
+    if confirm.upper() != "YES":
+        print("Aborted."); return
+    def unchanged(p):
+        try:
+            st = os.stat(p)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns) == seen[p]
+
+    done = failed = skipped = 0
+    for _, paths in groups:
+        keep = paths[0]
+        for p in paths[1:]:
+            if not (unchanged(keep) and unchanged(p)):
+                skipped += 1
+                print(f"{action} skipped: {p}: it or {keep} changed since the scan")
+                continue
+            try:
+                if action == "delete":
+                    retry_locked(_unlink, p)
+                else:
+                    retry_locked(_dedupe_link, keep, p)
+                done += 1
+            except OSError as e:
+                failed += 1
+                print(f"{action} failed: {p}: {e}")
+    print(f"{action}: {done} done, {failed} failed, {skipped} skipped (changed since the scan).")
+
+# ---- hash / verify (sha256sum-compatible manifests + size/mtime sidecar) ----
+HASH_ALGOS = ("sha256", "blake2b", "md5", "sha1", "sha512")
+HASH_BY_LENGTH = {32: "md5", 40: "sha1", 64: "sha256", 128: "blake2b"}
+
+def hash_many(paths, algo, jobs=8, progress=True):
+    """Hash files on a thread pool. Returns ({path: digest}, {path: error}, bytes_hashed, seconds)."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    sizes = {}
+    for p in paths:
+        try:
+            sizes[p] = os.path.getsize(p)
+        except OSError:
+            sizes[p] = 0
+    meter = Progress(sum(sizes.values()), enabled=progress)
+    digests, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(hash_file, p, algo, meter): p for p in paths}
+        try:
+            for fut in as_completed(futures):
+                p = futures[fut]
+                try:
+                    digests[p] = fut.result()
+                except OSError as e:
+                    errors[p] = e
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            meter.clear()
+    return digests, errors, meter.done, meter.elapsed()
+
+def _throughput(nbytes, seconds):
+    return f"{format_size(nbytes)} in {seconds:.2f}s ({nbytes / 1024 ** 3 / max(seconds, 1e-6):.2f} GB/s)"
+
+def cmd_hash(args=""):
+    """hash <path> [--algo sha256|blake2b|md5] [--out manifest] [--jobs N] [walk options]
+    Folders get a manifest (default <folder>/SHA256SUMS etc.) plus a .meta sidecar used by 'verify'."""
+    import json
+    pos, opts = parse_opts(args, flags=WALK_FLAGS, options=("--algo", "-a", "--out", "-o", "--jobs", "-j") + WALK_OPTIONS)
+    target = " ".join(pos) or input("File or folder to hash: ").strip()
+    if not target:
+        return
+    target = resolve_path(target)
+    algo = (opts.get("algo") or opts.get("a") or "sha256").lower()
+    if algo not in HASH_ALGOS:
+        print("Unsupported algorithm. Choose from:", ", ".join(HASH_ALGOS)); return
+    if not os.path.exists(target):
+        print("Not found:", target); return
+    jobs = max(1, opt_int(opts, "jobs", opt_int(opts, "j", 8)))
+    out = opts.get("out") or opts.get("o")
+    if os.path.isdir(target):
+        out = resolve_path(out) if out else os.path.join(target, f"{algo.upper()}SUMS")
+        skip = {out, out + ".meta"}
+        paths = sorted(e.path for e in walk_tree(target, **walk_options(opts, target)) if e.path not in skip)
+    else:
+        out = resolve_path(out) if out else None
+        paths = [target]
+    try:
+        digests, errors, nbytes, secs = hash_many(paths, algo, jobs=jobs)
+    except KeyboardInterrupt:
+        print("\nHashing interrupted.")
+        return
+    base = os.path.dirname(out) if out else os.path.dirname(target)
+    lines, meta = [], {}
+    for p in paths:
+        if p in digests:
+            try:
+                rel = os.path.relpath(p, base)
+            except ValueError:
+                rel = p   # another drive than the manifest (Windows): keep the absolute path
+            try:
+                st = os.stat(p)
+            except OSError as e:
+                errors[p] = e
+                continue
+            rel = rel.replace(os.sep, "/")
+            lines.append(f"{digests[p]}  {rel}")
+            meta[rel] = [st.st_size, st.st_mtime_ns]
+    for p, e in errors.items():
+        print(f"{p}: {e}")
+    if out:
+        with open(out, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        with open(out + ".meta", "w", encoding="utf-8") as f:
+            json.dump({"algo": algo, "written": time.time(), "files": meta}, f)
+        print(f"Wrote {len(lines)} {algo} digest(s) to {out}")
+    else:
+        for line in lines:
+            print(line)
+    print(f"{len(lines)} file(s), {_throughput(nbytes, secs)}, {len(errors)} error(s)")
+
+def cmd_verify(args=""):
+    """verify <manifest> [--full] [--algo A] [--jobs N] — re-hash files whose size/mtime changed (all with --full)."""
+    import json
+    pos, opts = parse_opts(args, flags=("--full",), options=("--algo", "-a", "--jobs", "-j"))
+    manifest = " ".join(pos) or input("Manifest file: ").strip()
+    if not manifest:
+        return
+    manifest = resolve_path(manifest)
+    if not os.path.isfile(manifest):
+        print("Not found:", manifest); return
+    entries = []
+    with open(manifest, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#"):
+                continue
+            digest, sep, name = line.partition(" ")
+            if not sep:
+                continue
+            # "<hex>  name" (text) or "<hex> *name" (binary)
+            entries.append((digest.lower(), name[1:] if name[:1] in (" ", "*") else name))
+    if not entries:
+        print("No entries in manifest."); return
+    meta = {}
+    try:
+        with open(manifest + ".meta", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        pass
+    algo = (opts.get("algo") or opts.get("a") or meta.get("algo")
+            or HASH_BY_LENGTH.get(len(entries[0][0]), "sha256")).lower()
+    known = meta.get("files", {})
+    base = os.path.dirname(manifest)
+    missing, unchanged, todo = [], 0, {}
+    for digest, rel in entries:
+        path = os.path.join(base, rel.replace("/", os.sep))
+        try:
+            st = os.stat(path)
+        except OSError:
+            missing.append(rel)
+            continue
+        if not opts.get("full") and known.get(rel) == [st.st_size, st.st_mtime_ns]:
+            unchanged += 1
+            continue
+        todo[path] = (rel, digest)
+    try:
+        digests, errors, nbytes, secs = hash_many(list(todo), algo, jobs=max(1, opt_int(opts, "jobs", opt_int(opts, "j", 8))))
+    except KeyboardInterrupt:
+        print("\nVerify interrupted.")
+        return
+    failed = 0
+    for path, (rel, expected) in sorted(todo.items(), key=lambda kv: kv[1][0]):
+        got = digests.get(path)
+        if got == expected:
+            print(f"{rel}: OK")
+        else:
+            failed += 1
+            print(f"{rel}: FAILED" + (f" ({errors[path]})" if path in errors else ""))
+    for rel in missing:
+        print(f"{rel}: MISSING")
+    print(f"{len(entries)} entries: {len(todo) - failed} re-hashed OK, {unchanged} unchanged (skipped), "
+          f"{failed} FAILED, {len(missing)} missing; {_throughput(nbytes, secs)} [{algo}]")
 
 # --- Fun & misc ---
 def cmd_say(args=""):
@@ -1264,27 +5031,111 @@ def cmd_remind(args=""):
         print("\nReminder cancelled.")
 
 # --- hexplain / history ---
+HEX_WIDTH = 16
+HEX_BATCH_ROWS = 4096   # rows formatted per write
+HEX_ASCII = bytes(b if 32 <= b < 127 else ord(".") for b in range(256))
+
+def hex_rows(data, start, end, base=0):
+    """Yield formatted dump blocks for data[start:end], HEX_BATCH_ROWS rows at a time.
+    Offsets shown are base + position. Uses bytes.hex/translate instead of per-byte formatting."""
+    step = HEX_WIDTH * HEX_BATCH_ROWS
+    for pos in range(start, end, step):
+        batch = data[pos:min(pos + step, end)]
+        text = batch.translate(HEX_ASCII).decode("latin-1")
+        lines = []
+        for i in range(0, len(batch), HEX_WIDTH):
+            chunk = batch[i:i + HEX_WIDTH]
+            lines.append(f"{base + pos + i:08X}  {chunk.hex(' ').upper():<47}   {text[i:i + HEX_WIDTH]}")
+        yield "\n".join(lines) + "\n"
+
+def _hex_pattern(text):
+    """'hex:DE AD be ef' -> bytes (ValueError if not valid hex); anything else is searched as UTF-8 text."""
+    if text[:4].lower() == "hex:":
+        compact = text[4:].replace(" ", "")
+        if not compact:
+            raise ValueError("empty hex pattern")
+        return bytes.fromhex(compact)
+    return text.encode("utf-8")
+
+def _hex_pager(data, offset, end):
+    rows = max(4, shutil.get_terminal_size((80, 25)).lines - 2)
+    pos = offset
+    while pos < end:
+        stop = min(pos + rows * HEX_WIDTH, end)
+        for block in hex_rows(data, pos, stop):
+            sys.stdout.write(block)
+        pos = stop
+        if pos >= end:
+            break
+        cmd = input(f"-- {pos:08X}/{end:08X} -- Enter=next  q=quit  @<offset>=jump  /<text|hex:..>=find: ").strip()
+        if cmd.lower() == "q":
+            break
+        if cmd.startswith("@"):
+            try:
+                pos = min(int(cmd[1:], 0), end) // HEX_WIDTH * HEX_WIDTH
+            except ValueError:
+                print("Bad offset.")
+        elif cmd.startswith("/") and len(cmd) > 1:
+            try:
+                hit = data.find(_hex_pattern(cmd[1:]), pos)
+            except ValueError:
+                print("Bad hex pattern.")
+                continue
+            if hit == -1 or hit >= end:
+                print("Pattern not found.")
+            else:
+                pos = hit // HEX_WIDTH * HEX_WIDTH
+
 def cmd_hexplain(args=""):
+    """hexplain <file> [--offset N] [--length N] [--find text|hex:DEADBEEF] [--pager] | hexplain :s <text>"""
+    import mmap
     s = args.strip() or input("Filename or ':s <text>': ").strip()
     if s.startswith(":s "):
         b = s[3:].encode("utf-8", errors="replace")
-        width = 16
-        for i in range(0, len(b), width):
-            chunk = b[i:i+width]
-            hex_bytes = " ".join(f"{bb:02X}" for bb in chunk)
-            ascii_repr = "".join(chr(bb) if 32 <= bb < 127 else "." for bb in chunk)
-            print(f"{i:08X}  {hex_bytes:<48}  {ascii_repr}")
+        for block in hex_rows(b, 0, len(b)):
+            sys.stdout.write(block)
         return
+    pos, opts = parse_opts(s, flags=("--pager", "-p"), options=("--offset", "-o", "--length", "-l", "--find", "-f"))
+    s = " ".join(pos)
     if not os.path.exists(s):
         print("File not found:", s)
         return
-    data = Path(s).read_bytes()
-    width = 16
-    for i in range(0, len(data), width):
-        chunk = data[i:i+width]
-        hex_bytes = " ".join(f"{bb:02X}" for bb in chunk)
-        ascii_repr = "".join(chr(bb) if 32 <= bb < 127 else "." for bb in chunk)
-        print(f"{i:08X}  {hex_bytes:<48}  {ascii_repr}")
+    try:
+        offset = int(opts.get("offset") or opts.get("o") or "0", 0)
+        length = int(opts.get("length") or opts.get("l") or "-1", 0)
+    except ValueError:
+        print("Offsets/lengths must be integers (0x.. hex allowed).")
+        return
+    with open(s, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            print("(empty file)")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if offset < 0:
+                offset = max(0, size + offset)
+            offset = min(offset, size)
+            pattern = opts.get("find") or opts.get("f")
+            if pattern:
+                try:
+                    hit = data.find(_hex_pattern(pattern), offset)
+                except ValueError:
+                    print("Bad hex pattern (use hex:DE AD BE EF).")
+                    return
+                if hit == -1:
+                    print("Pattern not found.")
+                    return
+                print(f"Found at offset 0x{hit:X} ({hit})")
+                offset = hit // HEX_WIDTH * HEX_WIDTH
+            end = size if length < 0 else min(size, offset + length)
+            try:
+                if opts.get("pager") or opts.get("p"):
+                    _hex_pager(data, offset, end)
+                else:
+                    for block in hex_rows(data, offset, end):
+                        sys.stdout.write(block)
+            except KeyboardInterrupt:
+                print("\nHex dump stopped.")
 
 def cmd_history(args=""):
     print("History file:", HIST_PATH)
@@ -1301,50 +5152,57 @@ def cmd_savehistory(args=""):
 # --- explanations ---
 EXPLAINS = {
     "freeminecraft":"get a link to free minecraft",
-    "chatbot":"connect to a ai chatbot",
+    "chatbot":"chatbot [--budget N] — connect to a ai chatbot (replies stream as they are generated; shows time-to-first-token, tokens/sec and request size; older turns are summarized to stay within N estimated tokens).",
     "help":"Show categorized help. Use 'explain <command>' for details.",
+    "walk":"walk options (find, search, recent, compress): --max-depth N, --one-filesystem/-x, --follow-links, --gitignore, --exclude glob,.., --exclude-from <file>.",
     "ping":"ping — test reachability. Use Ctrl+C to stop continuous ping.",
-    "fastping":"fastping — repeated single pings with interval (sub-second possible).",
+    "fastping":"fastping <host>[,host..] [-c N] [-i sec] [--port P] [--icmp] [--timeout s] [--window N] — concurrent in-process pinger (TCP connect or unprivileged ICMP) with rolling min/avg/max/p95/loss.",
     "pingpayload":"pingpayload — interactive: set count and payload size.",
     "pinginline":"pinginline — ping with flags inline.",
     "tracert":"tracert — trace route to host.",
     "ns":"ns — run nslookup for host.",
-    "get-ip":"get-ip/ip — resolve domain, website, or email address to IP address(es).",
-    "ip":"get-ip/ip — resolve domain, website, or email address to IP address(es).",
-    "ipsearch":"ipsearch — reverse IP lookup, find hostname/domain associated with an IP address.",
-    "netinfo":"netinfo — show network interfaces, ARP, routes, Wi-Fi info, user.",
-    "saveinfo":"saveinfo — saves netinfo output to temp file.",
-    "myip":"myip — show local outbound and public IP.",
+    "get-ip":"get-ip/ip — resolve domain, website, or email address to IP address(es); --file hosts.txt [--format csv|json] [--out f] [--jobs N] resolves a list concurrently (cached, with latency column).",
+    "ip":"get-ip/ip — resolve domain, website, or email address to IP address(es); --file hosts.txt [--format csv|json] [--out f] [--jobs N] resolves a list concurrently (cached, with latency column).",
+    "ipsearch":"ipsearch — reverse IP lookup, find hostname/domain associated with an IP address; --file ips.txt [--format csv|json] [--out f] bulk mode.",
+    "netinfo":"netinfo [--json] [--deadline S] — concurrent snapshot of interfaces, ARP, routes, DNS, Wi-Fi, user and public IP (reads /proc and /sys directly on Linux).",
+    "saveinfo":"saveinfo [--deadline S] — save a netinfo snapshot as JSON + text to temp folder; saveinfo --diff <old.json> [new.json] shows what changed.",
+    "myip":"myip [--refresh] — show local and public IP (providers raced in parallel, answer cached 60s; VENOM_IP_SERVICES overrides the provider list).",
     "wifi":"wifi — show connected Wi-Fi info via netsh.",
-    "speedtest":"speedtest — runs speedtest-cli or speedtest if installed.",
-    "dnsflush":"dnsflush — flush DNS cache (ipconfig /flushdns).",
+    "speedtest":"speedtest --url <endpoint> [--upload-url u] [--streams N] [--duration S] [--no-upload] — parallel streaming GET/POST throughput test with per-second Mbps and latency under load; without --url runs speedtest-cli if installed.",
+    "dnsflush":"dnsflush — flush DNS cache (ipconfig /flushdns) and the console's own lookup cache.",
     "hostname":"hostname — print hostname.",
-    "netstat":"netstat — lists active network connections.",
-    "arp":"arp — show ARP table.",
-    "ports":"ports — alias to netstat listing.",
+    "netstat":"netstat [--state LISTEN,..] [--port N] [--pid N] [--proto tcp|udp] [--group] [--watch SEC] — socket table (from /proc on Linux, the IP helper API on Windows, netstat -ano elsewhere); --group counts by remote host, --watch prints only changes.",
+    "arp":"arp [--watch SEC] — show ARP/neighbour table; --watch prints only changes.",
+    "ports":"ports — listening TCP / bound UDP sockets with owning PID; accepts netstat filters.",
     "users":"users — list user accounts or logged-in users.",
-    "http":"http — HTTP HEAD request, shows status and headers.",
-    "download":"download — download a URL to temp folder.",
+    "http":"http <url> [-X METHOD] [--repeat N] [--insecure] — request with DNS/connect/TLS/TTFB/total timing over keep-alive; --bench [-n 1000] [-c 32] load test with latency histogram and req/s.",
+    "download":"download <url> [--out file] [--segments N] [--checksum sha256:<hex>] — parallel ranged download with live MB/s; interrupted downloads resume, servers without ranges stream over one connection.",
     "open":"open — open URL/file with default handler.",
-    "sendemail":"sendemail/email — send an email via SMTP (interactive setup).",
-    "email":"sendemail/email — send an email via SMTP (interactive setup).",
+    "sendemail":"sendemail/email [--debug] — send an email via SMTP (interactive setup). Batch: --batch recipients.csv --template body.txt --server host[:port] --from addr [--user u (password from VENOM_SMTP_PASSWORD or a prompt)] [--subject s] [--connections N] [--rate N/s] [--retries N] [--dry-run]; $column placeholders are filled per recipient.",
+    "email":"sendemail/email [--debug] — send an email via SMTP (interactive setup). Batch: --batch recipients.csv --template body.txt --server host[:port] --from addr [--user u (password from VENOM_SMTP_PASSWORD or a prompt)] [--subject s] [--connections N] [--rate N/s] [--retries N] [--dry-run]; $column placeholders are filled per recipient.",
     "ls":"ls/dir — list directory entries.",
     "cd":"cd — change directory.",
-    "cat":"cat/type — print file contents.",
-    "copy":"copy — copy files.",
+    "cat":"cat/type <file> [--head N] [--tail N] [--follow] — stream file contents; --follow prints appended data.",
+    "copy":"copy — copy files or folders (same as copyfile).",
     "del":"del/rm — delete files (supports glob).",
     "rename":"rename/mv — rename files.",
     "mkdir":"mkdir — make directory.",
     "rmdir":"rmdir — remove directory recursively.",
-    "find":"find — search files by name (supports glob).",
-    "search":"search — search text inside files.",
-    "copyfile":"copyfile — copy file (handles folders as dest).",
+    "find":"find <pattern> [path] [--index] [--refresh] — search files by name (supports glob; --index answers from the filename index).",
+    "index":"index build|status|drop <path> [--full] — manage the filename index; build re-scans only changed directories.",
+    "search":"search <text> [path] [--regex] [-i] [--all] [--jobs N] — parallel text search inside files (skips binaries, mmaps large files).",
+    "copyfile":"copyfile <src> <dst> [--jobs N] [--resume] — fast copy of a file or folder tree (kernel copy where available, MB/s + ETA, resumable).",
+    "sync":"sync <src> <dst> [--checksum] [--delete] [--dry-run] [--jobs N] — copy only new/changed files (size+mtime or hash); --delete removes extras after YES.",
     "movefile":"movefile — move/rename file or folder.",
-    "deletefile":"deletefile — delete file or folder (confirmation).",
-    "compress":"compress — create zip from folder/file.",
-    "extract":"extract — extract zip file.",
-    "filesize":"filesize — show human-readable size.",
-    "recent":"recent — list recently modified files.",
+    "deletefile":"deletefile <path> [--dry-run] [--jobs N] — delete file or folder tree in parallel (YES confirmation; --dry-run reports count and bytes).",
+    "compress":"compress <path> [dest] [--level 0-9] [--store] [--jobs N] — create zip from folder/file using all cores (already-compressed types are stored).",
+    "extract":"extract <zip> [dest] [--include/--exclude globs] [--jobs N] [--force] [--list] [--member name --to file|-] — parallel, CRC-checked zip extraction; unchanged files are skipped.",
+    "filesize":"filesize — show human-readable size (--recursive for folder contents, same as du).",
+    "du":"du [path] [-n N] [--jobs N] [--no-cache] — folder size with heaviest subdirectories/files; folders whose modification time is unchanged come from cache (a file growing in place does not change it; use --no-cache to rescan everything).",
+    "dupes":"dupes <path> [--min-size 1K] [--jobs N] [--delete | --hardlink] — find duplicate files (size, then partial hash, then full hash); optional cleanup after YES.",
+    "hash":"hash <path> [--algo sha256|blake2b|md5] [--out manifest] [--jobs N] — parallel file hashing; folders get a sha256sum-compatible manifest.",
+    "verify":"verify <manifest> [--full] — re-check files listed in a manifest; only files whose size/mtime changed are re-hashed unless --full.",
+    "recent":"recent [path] [-n N] [--ext .py,.log] [--max-age 2h] [--min-age 1d] [--since <timestamp>] — list most recently modified files.",
     "sysinfo":"sysinfo — print OS/CPU/memory info (psutil improves output).",
     "battery":"battery — show battery status (WMIC).",
     "storage":"storage — show mounted drives and free space.",
@@ -1360,7 +5218,7 @@ EXPLAINS = {
     "clock":"clock — live clock (Ctrl+C stops).",
     "timer":"timer — countdown timer.",
     "remind":"remind — set a delayed reminder.",
-    "hexplain":"hexplain — hex dump of file or string.",
+    "hexplain":"hexplain <file> [--offset N] [--length N] [--find text|hex:DEADBEEF] [--pager] — memory-mapped hex dump of file; ':s <text>' dumps a string.",
     "history":"history — show saved command history file.",
     "savehistory":"savehistory — save custom entry to history."
 }
@@ -1393,11 +5251,12 @@ COMMANDS = {
     "sendemail": cmd_sendemail, "email": cmd_email,
     # files
     "ls": cmd_ls, "dir": cmd_ls, "cd": cmd_cd, "cat": cmd_cat, "type": cmd_cat,
-    "copy": cmd_copyfile, "copyfile": cmd_copyfile, "movefile": cmd_movefile, "deletefile": cmd_deletefile,
+    "copy": cmd_copyfile, "copyfile": cmd_copyfile, "sync": cmd_sync, "movefile": cmd_movefile, "deletefile": cmd_deletefile,
     "del": cmd_deletefile, "rm": cmd_deletefile, "rename": cmd_rename, "mv": cmd_rename,
     "mkdir": cmd_mkdir, "rmdir": cmd_rmdir,
-    "find": cmd_find, "search": cmd_search, "compress": cmd_compress, "extract": cmd_extract,
-    "filesize": cmd_filesize, "recent": cmd_recent,
+    "find": cmd_find, "index": cmd_index, "search": cmd_search, "compress": cmd_compress, "extract": cmd_extract,
+    "filesize": cmd_filesize, "du": cmd_du, "recent": cmd_recent, "dupes": cmd_dupes,
+    "hash": cmd_hash, "verify": cmd_verify,
     # system extras
     "sysinfo": cmd_sysinfo, "battery": cmd_battery, "storage": cmd_storage,
     "processes": cmd_processes, "kill": cmd_kill, "whoami": cmd_whoami, "whereami": cmd_whereami,